@@ -0,0 +1,109 @@
+'''
+Pre-binned representation of the credit features.
+
+Each feature is quantized once into at most 255 quantile bins and stored as uint8 codes, with
+code 255 reserved for missing values. The bin edges and the codes are cached on disk so later
+training runs skip both the CSV parse and the quantization, and hold the data in an eighth of
+the memory of the float64 frame. The cache records the size and modification time of the CSV
+it was built from and is rebuilt when either changes.
+
+Models trained on the codes must score codes too: keep the edges with the model (see
+credit_predictor.save_model) and bin new data with transform_bins or get_binned_test_data.
+'''
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from credit_predictor import TARGET, TRAINING_DATA_PATH, get_test_data, get_training_data
+
+BIN_CACHE_DIR = "Credit_Predictor/data/binned"
+MAX_BINS = 255
+MISSING_BIN = 255
+
+
+def fit_bins(X, max_bins=MAX_BINS):
+    edges = {}
+    quantiles = np.linspace(0, 1, max_bins + 1)[1:-1]
+    for column in X.columns:
+        values = X[column].to_numpy(dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            edges[column] = np.array([], dtype=np.float64)
+            continue
+        edges[column] = np.unique(np.quantile(values, quantiles))
+    return edges
+
+
+def transform_bins(X, edges):
+    codes = np.empty((len(X), len(edges)), dtype=np.uint8)
+    for j, (column, column_edges) in enumerate(edges.items()):
+        values = X[column].to_numpy(dtype=np.float64)
+        column_codes = np.searchsorted(column_edges, values, side="right")
+        column_codes[np.isnan(values)] = MISSING_BIN
+        codes[:, j] = column_codes
+    return pd.DataFrame(codes, columns=list(edges), index=X.index)
+
+
+def save_bins(edges, path):
+    # Column order is kept in a separate array since npz keys are not ordered on load
+    np.savez(path, __columns__=np.array(list(edges)), **edges)
+
+
+def load_bins(path):
+    with np.load(path, allow_pickle=False) as stored:
+        return {column: stored[column] for column in stored["__columns__"]}
+
+
+def source_fingerprint(path):
+    stat = os.stat(path)
+    return {"path": os.path.abspath(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def get_binned_training_data(cache_dir=BIN_CACHE_DIR):
+    """
+    Returns the binned training features, the target and the bin edges, building and caching
+    them on the first call and reading the cached arrays on later ones, as long as the
+    training CSV is unchanged.
+    """
+    edges_path = os.path.join(cache_dir, "edges.npz")
+    codes_path = os.path.join(cache_dir, "codes.npy")
+    target_path = os.path.join(cache_dir, "target.npy")
+    source_path = os.path.join(cache_dir, "source.json")
+    fingerprint = source_fingerprint(TRAINING_DATA_PATH)
+
+    cached_fingerprint = None
+    if os.path.exists(source_path):
+        with open(source_path) as f:
+            cached_fingerprint = json.load(f)
+
+    if cached_fingerprint == fingerprint and all(os.path.exists(path) for path in (edges_path, codes_path, target_path)):
+        edges = load_bins(edges_path)
+        X = pd.DataFrame(np.load(codes_path), columns=list(edges))
+        y = pd.Series(np.load(target_path), name=TARGET)
+        return X, y, edges
+
+    data = get_training_data(compact=True)
+    X = data.drop(columns=[TARGET])
+    y = data[TARGET]
+    edges = fit_bins(X)
+    X = transform_bins(X, edges)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    if os.path.exists(source_path):
+        os.remove(source_path)
+    save_bins(edges, edges_path)
+    np.save(codes_path, X.to_numpy())
+    np.save(target_path, y.to_numpy())
+    # Written last, so an interrupted build is never mistaken for a valid cache
+    with open(source_path, "w") as f:
+        json.dump(fingerprint, f)
+    print(f"✅ Binned training data cached in: {cache_dir}")
+    return X, y, edges
+
+
+def get_binned_test_data(edges):
+    # Binned with the training edges; test rows are never used to fit bins
+    return transform_bins(get_test_data(compact=True), edges)
@@ -1,30 +1,174 @@
+import os
+import queue
+import sys
+import threading
+import time
+
+import joblib
+import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
+from joblib import Parallel, delayed
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
 from sklearn.metrics import roc_auc_score
 from sklearn.metrics import brier_score_loss
-from sklearn.model_selection import GridSearchCV
+from sklearn.utils import check_random_state
 
-def get_test_data():
-    path = "Credit_Predictor/data/cs-test.csv"
-    df = pd.read_csv(path)
-    return df
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from instrumentation import count, traced
+
+TRAINING_DATA_PATH = "Credit_Predictor/data/cs-training.csv"
+TEST_DATA_PATH = "Credit_Predictor/data/cs-test.csv"
+MODEL_PATH = "Credit_Predictor/data/credit_model.joblib"
+TARGET = "SeriousDlqin2yrs"
+
+def get_test_data(compact=False):
+    df = pd.read_csv(TEST_DATA_PATH)
+    return compact_dtypes(df) if compact else df
 
-def get_training_data():
-    path = "Credit_Predictor/data/cs-training.csv"
-    df = pd.read_csv(path)
+def get_training_data(compact=False):
+    df = pd.read_csv(TRAINING_DATA_PATH)
+    return compact_dtypes(df) if compact else df
+
+def compact_dtypes(df):
+    # float32 keeps every credit feature well within precision and halves the frame
+    df = df.copy()
+    for column in df.columns:
+        if pd.api.types.is_float_dtype(df[column]):
+            df[column] = df[column].astype(np.float32)
+        elif pd.api.types.is_integer_dtype(df[column]):
+            df[column] = pd.to_numeric(df[column], downcast="integer")
     return df
 
-def random_forest_model():
-    model = RandomForestClassifier(n_estimators=10000, random_state=42)
+def random_forest_model(n_estimators=10000, warm_start=False, oob_score=False):
+    model = RandomForestClassifier(
+        n_estimators=n_estimators,
+        random_state=42,
+        n_jobs=-1,
+        warm_start=warm_start,
+        oob_score=oob_score
+    )
+    return model
+
+def hist_gradient_boosting_model(max_iter=500):
+    model = HistGradientBoostingClassifier(
+        max_iter=max_iter,
+        learning_rate=0.05,
+        early_stopping=True,
+        random_state=42
+    )
     return model
 
-def train_model(X, y):
-    model = random_forest_model()
+@traced("credit.train_model")
+def train_model(X, y, backend="forest", incremental=False, **incremental_kwargs):
+    """
+    backend="forest" fits the exact-split random forest on raw features.
+    backend="hist" fits a histogram-based booster, intended for the uint8 bin codes
+    produced by binning.transform_bins. Its bin edges must be passed to save_model and
+    predict so new data is binned the same way.
+    """
+    if backend == "hist":
+        model = hist_gradient_boosting_model()
+    elif backend == "forest":
+        if incremental:
+            model, _ = train_model_incremental(X, y, **incremental_kwargs)
+            return model
+        model = random_forest_model()
+    else:
+        raise ValueError(f"Unknown backend: {backend!r} (expected 'forest' or 'hist')")
     model.fit(X, y)
     return model
 
-def predict(model, X):
+def _tree_oob_votes(tree, X):
+    # Same bootstrap draw RandomForestClassifier makes for the tree (bootstrap=True, no
+    # max_samples or sample weights), so the unsampled rows are exactly its OOB rows
+    n_samples = len(X)
+    in_bag = check_random_state(tree.random_state).randint(0, n_samples, n_samples)
+    unsampled = np.flatnonzero(np.bincount(in_bag, minlength=n_samples) == 0)
+    return unsampled, tree.predict_proba(X[unsampled])
+
+def add_oob_votes(trees, X, oob_votes, oob_counts):
+    # Tree prediction releases the GIL, so threads spread the new trees across cores
+    results = Parallel(n_jobs=-1, prefer="threads")(delayed(_tree_oob_votes)(tree, X) for tree in trees)
+    for unsampled, proba in results:
+        oob_votes[unsampled] += proba
+        oob_counts[unsampled] += 1
+
+def oob_scores(oob_votes, oob_counts, y):
+    # Rows that were in-bag for every tree so far have no OOB vote yet
+    has_vote = oob_counts > 0
+    y = np.asarray(y)[has_vote]
+    proba = oob_votes[has_vote, 1] / oob_counts[has_vote]
+    return roc_auc_score(y, proba), brier_score_loss(y, proba)
+
+def train_model_incremental(X, y, step=250, max_estimators=10000, min_improvement=1e-4,
+                            patience=3, time_budget=None, log_path=None):
+    """
+    Grows the forest `step` trees at a time with warm start, scoring the out-of-bag
+    predictions after each increment. Stops once the OOB ROC AUC has gained less than
+    `min_improvement` over its best for `patience` increments in a row, `max_estimators` is
+    reached, or `time_budget` seconds have passed. Returns the model and a trees/score/time history.
+
+    OOB votes are accumulated only for the trees added by each increment, rather than letting
+    sklearn recompute them over the whole forest (oob_score=True) on every fit.
+    """
+    model = random_forest_model(n_estimators=0, warm_start=True)
+    X_oob = np.asarray(X, dtype=np.float32)
+    oob_votes = np.zeros((len(X_oob), 2))
+    oob_counts = np.zeros(len(X_oob), dtype=np.int64)
+    history = []
+    best_auc = -np.inf
+    stale_increments = 0
+    start = time.perf_counter()
+
+    while model.n_estimators < max_estimators:
+        grown = len(getattr(model, "estimators_", []))
+        model.n_estimators = min(model.n_estimators + step, max_estimators)
+        model.fit(X, y)
+        add_oob_votes(model.estimators_[grown:], X_oob, oob_votes, oob_counts)
+
+        auc, brier = oob_scores(oob_votes, oob_counts, y)
+        elapsed = time.perf_counter() - start
+        history.append({
+            "n_estimators": model.n_estimators,
+            "oob_roc_auc": auc,
+            "oob_brier": brier,
+            "elapsed_seconds": elapsed
+        })
+        print(f"Trees: {model.n_estimators:>6}  OOB ROC AUC: {auc:.5f}  "
+              f"OOB Brier: {brier:.5f}  Time: {elapsed:.1f}s")
+
+        if auc - best_auc < min_improvement:
+            stale_increments += 1
+            if stale_increments >= patience:
+                print(f"Stopping: OOB ROC AUC improved by less than {min_improvement} "
+                      f"for {patience} increments")
+                break
+        else:
+            stale_increments = 0
+        best_auc = max(best_auc, auc)
+        if time_budget is not None and elapsed >= time_budget:
+            print(f"Stopping: time budget of {time_budget}s reached")
+            break
+
+    history = pd.DataFrame(history)
+    if log_path is not None:
+        history.to_csv(log_path, index=False)
+        print(f"✅ Forest growth log saved to: {log_path}")
+    return model, history
+
+@traced("credit.predict")
+def predict(model, X, edges=None):
+    """
+    Scores raw features. For the hist backend pass the training bin edges: X is binned with
+    them first, missing values included, so no imputation is needed.
+    """
+    if edges is not None:
+        from binning import transform_bins
+        X = transform_bins(X, edges)
+    elif isinstance(model, HistGradientBoostingClassifier):
+        raise ValueError("The hist backend scores uint8 bin codes; pass the bin edges it was trained with")
     predictions = model.predict_proba(X)
+    count("credit.rows_scored", len(X))
     return predictions
 
 def createsubmission_file(predictions, filename="submission.csv"):
@@ -37,10 +181,124 @@ def createsubmission_file(predictions, filename="submission.csv"):
     print(f"✅ Submission file saved to: {filename}")
 
 
-def correct_missing_values(df):
-    df = df.fillna(df.median())
+def fit_missing_values(df):
+    return df.median()
+
+def correct_missing_values(df, fill_values=None):
+    if fill_values is None:
+        fill_values = fit_missing_values(df)
+    df = df.fillna(fill_values)
     return df
 
+def save_model(model, fill_values, path=MODEL_PATH, edges=None):
+    # The training medians (or, for the hist backend, the bin edges) travel with the model so
+    # scoring never derives them from its own input
+    joblib.dump({"model": model, "fill_values": fill_values, "edges": edges}, path)
+    print(f"✅ Model saved to: {path}")
+
+def load_model(path=MODEL_PATH):
+    bundle = joblib.load(path)
+    return bundle["model"], bundle["fill_values"], bundle.get("edges")
+
+# How often a blocked stage wakes up to check whether the pipeline has been stopped
+QUEUE_POLL_SECONDS = 0.1
+
+def _put(out_queue, item, stop):
+    # Returns False instead of blocking forever once another stage has stopped the pipeline
+    while not stop.is_set():
+        try:
+            out_queue.put(item, timeout=QUEUE_POLL_SECONDS)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+def _get(in_queue, stop):
+    # Returns None at the end of the stream or once the pipeline has been stopped
+    while not stop.is_set():
+        try:
+            return in_queue.get(timeout=QUEUE_POLL_SECONDS)
+        except queue.Empty:
+            pass
+    return None
+
+def _drain(*queues):
+    for q in queues:
+        while True:
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                break
+
+def _run_stage(work, errors, out_queue, stop):
+    try:
+        work()
+    except BaseException as e:
+        errors.append(e)
+        stop.set()
+    finally:
+        _put(out_queue, None, stop)
+
+def score_file_streaming(model, fill_values, input_path=TEST_DATA_PATH, filename="submission.csv",
+                         chunksize=50_000, max_queued_chunks=4, edges=None):
+    """
+    Scores `input_path` chunk by chunk and appends the probabilities to `filename`.
+    Reading, scoring and writing run concurrently, connected by bounded queues, so at most
+    a few chunks are held in memory regardless of the input size. A failure in any stage
+    sets a shared stop event, so the other stages give up instead of blocking on a queue.
+    With `edges` (hist backend) chunks are binned instead of imputed.
+    """
+    features = list(model.feature_names_in_)
+    raw_chunks = queue.Queue(maxsize=max_queued_chunks)
+    scored_chunks = queue.Queue(maxsize=max_queued_chunks)
+    stop = threading.Event()
+    errors = []
+
+    def read():
+        for chunk in pd.read_csv(input_path, chunksize=chunksize):
+            if not _put(raw_chunks, chunk, stop):
+                return
+
+    def score():
+        # Ids continue across chunks to match createsubmission_file
+        next_id = 1
+        while (chunk := _get(raw_chunks, stop)) is not None:
+            X = chunk[features]
+            if edges is None:
+                X = correct_missing_values(X, fill_values[features])
+            probabilities = predict(model, X, edges)[:, 1]
+            ids = np.arange(next_id, next_id + len(chunk))
+            next_id += len(chunk)
+            if not _put(scored_chunks, pd.DataFrame({"Id": ids, "Probability": probabilities}), stop):
+                return
+
+    stages = [
+        threading.Thread(target=_run_stage, args=(read, errors, raw_chunks, stop), daemon=True),
+        threading.Thread(target=_run_stage, args=(score, errors, scored_chunks, stop), daemon=True)
+    ]
+    for stage in stages:
+        stage.start()
+
+    rows = 0
+    try:
+        with open(filename, "w", newline="") as f:
+            while (scored := _get(scored_chunks, stop)) is not None:
+                scored.to_csv(f, header=(rows == 0), index=False)
+                rows += len(scored)
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        for stage in stages:
+            stage.join()
+        # Release any chunks still queued after a failure
+        _drain(raw_chunks, scored_chunks)
+
+    if errors:
+        raise errors[0]
+    print(f"✅ Submission file saved to: {filename} ({rows} rows)")
+    return rows
+
 def check_results(y_true, y_pred):
     score = roc_auc_score(y_true, y_pred[:, 1])
     print(f"ROC AUC Score: {score}")
@@ -50,14 +308,12 @@ def check_results(y_true, y_pred):
 
 if __name__ == "__main__":
     data = get_training_data()
-    data = correct_missing_values(data)
-    X = data.drop(columns=["SeriousDlqin2yrs"])
-    y = data["SeriousDlqin2yrs"]
-    model = train_model(X, y)
-
-    test_data = get_test_data()
-    test_data = correct_missing_values(test_data)
-    X_test = test_data.drop(columns=["SeriousDlqin2yrs"])
-    predictions = predict(model, X_test)
+    X = data.drop(columns=[TARGET])
+    y = data[TARGET]
+    fill_values = fit_missing_values(X)
+    X = correct_missing_values(X, fill_values)
+    model = train_model(X, y, incremental=True, log_path="Credit_Predictor/data/forest_growth_log.csv")
+    save_model(model, fill_values)
 
-    createsubmission_file(predictions, filename="submission.csv")
+    model, fill_values, edges = load_model()
+    score_file_streaming(model, fill_values, filename="submission.csv", edges=edges)
@@ -0,0 +1,171 @@
+'''
+Successive halving search over the credit random forest.
+
+Every candidate is first trained with a handful of trees on a small subsample of the training
+data; only the best 1/eta of each rung is promoted to the next one, where trees and data both
+grow by a factor of eta. Trials run in parallel across cores and every finished trial is written
+to an on-disk cache keyed by its parameters, budget, a hash of the data and the train/validation
+split, so an interrupted or repeated search picks up where it left off.
+'''
+
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import roc_auc_score, brier_score_loss
+from sklearn.model_selection import ParameterGrid, train_test_split
+
+from credit_predictor import TARGET, get_training_data, fit_missing_values, correct_missing_values
+
+CACHE_DIR = "Credit_Predictor/data/search_cache"
+
+DEFAULT_PARAM_GRID = {
+    "max_depth": [6, 10, 16, None],
+    "min_samples_leaf": [1, 5, 20, 50],
+    "max_features": ["sqrt", 0.5],
+}
+
+
+def data_hash(X, y):
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(X, index=True).values.tobytes())
+    digest.update(pd.util.hash_pandas_object(y, index=True).values.tobytes())
+    digest.update(",".join(map(str, X.columns)).encode())
+    return digest.hexdigest()
+
+
+def split_hash(X_train, X_val):
+    # Scores are only comparable between trials validated on the same rows
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(X_train.index.to_series(), index=False).values.tobytes())
+    digest.update(b"|")
+    digest.update(pd.util.hash_pandas_object(X_val.index.to_series(), index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def trial_key(params, n_estimators, n_samples, dataset_hash, val_size, random_state, validation_hash):
+    payload = json.dumps({
+        "params": params,
+        "n_estimators": n_estimators,
+        "n_samples": n_samples,
+        "data": dataset_hash,
+        "val_size": val_size,
+        "random_state": random_state,
+        "split": validation_hash
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def load_cached_trial(cache_dir, key):
+    path = os.path.join(cache_dir, f"{key}.json")
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_cached_trial(cache_dir, key, result):
+    # Write then rename so a search killed mid-write never leaves a truncated entry behind
+    path = os.path.join(cache_dir, f"{key}.json")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(result, f)
+    os.replace(tmp_path, path)
+
+
+def run_trial(params, n_estimators, n_samples, X_train, y_train, X_val, y_val, random_state=42):
+    if n_samples < len(X_train):
+        X_train, _, y_train, _ = train_test_split(
+            X_train, y_train, train_size=n_samples, stratify=y_train, random_state=random_state
+        )
+    model = RandomForestClassifier(
+        n_estimators=n_estimators,
+        random_state=random_state,
+        n_jobs=1,
+        **params
+    )
+    model.fit(X_train, y_train)
+    proba = model.predict_proba(X_val)[:, 1]
+    return {
+        "params": params,
+        "n_estimators": n_estimators,
+        "n_samples": n_samples,
+        "roc_auc": roc_auc_score(y_val, proba),
+        "brier": brier_score_loss(y_val, proba)
+    }
+
+
+def run_and_cache_trial(cache_dir, key, *trial_args):
+    # Each worker persists its own result so trials finished before an interruption are kept
+    result = run_trial(*trial_args)
+    save_cached_trial(cache_dir, key, result)
+    return result
+
+
+def successive_halving_search(X, y, param_grid=DEFAULT_PARAM_GRID, min_estimators=25,
+                              max_estimators=800, min_samples=5_000, eta=3, val_size=0.2,
+                              cache_dir=CACHE_DIR, n_jobs=-1, random_state=42):
+    """
+    Runs successive halving over `param_grid` and returns the best parameters and a frame with
+    every trial that was evaluated or read back from the cache.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    X_train, X_val, y_train, y_val = train_test_split(
+        X, y, test_size=val_size, stratify=y, random_state=random_state
+    )
+    dataset_hash = data_hash(X, y)
+    validation_hash = split_hash(X_train, X_val)
+
+    candidates = list(ParameterGrid(param_grid))
+    n_estimators, n_samples = min_estimators, min(min_samples, len(X_train))
+    all_results = []
+    rung = 0
+
+    while True:
+        keys = [
+            trial_key(params, n_estimators, n_samples, dataset_hash, val_size, random_state, validation_hash)
+            for params in candidates
+        ]
+        results = [load_cached_trial(cache_dir, key) for key in keys]
+        pending = [i for i, result in enumerate(results) if result is None]
+        print(f"Rung {rung}: {len(candidates)} candidates, {n_estimators} trees, "
+              f"{n_samples} rows ({len(candidates) - len(pending)} cached)")
+
+        fresh = Parallel(n_jobs=n_jobs)(
+            delayed(run_and_cache_trial)(cache_dir, keys[i], candidates[i], n_estimators, n_samples,
+                                         X_train, y_train, X_val, y_val, random_state)
+            for i in pending
+        )
+        for i, result in zip(pending, fresh):
+            results[i] = result
+
+        for result in results:
+            all_results.append({"rung": rung, **result})
+
+        if len(candidates) == 1 or n_estimators >= max_estimators:
+            break
+
+        order = np.argsort([-result["roc_auc"] for result in results], kind="stable")
+        survivors = max(1, len(candidates) // eta)
+        candidates = [candidates[i] for i in order[:survivors]]
+        n_estimators = min(n_estimators * eta, max_estimators)
+        n_samples = min(n_samples * eta, len(X_train))
+        rung += 1
+
+    best = max(results, key=lambda result: result["roc_auc"])
+    return best["params"], pd.DataFrame(all_results)
+
+
+if __name__ == "__main__":
+    data = get_training_data()
+    X = data.drop(columns=[TARGET])
+    y = data[TARGET]
+    X = correct_missing_values(X, fit_missing_values(X))
+
+    best_params, trials = successive_halving_search(X, y)
+    print(trials.sort_values(["rung", "roc_auc"], ascending=[True, False]).to_string(index=False))
+    print(f"Best parameters: {best_params}")
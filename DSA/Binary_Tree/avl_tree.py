@@ -0,0 +1,217 @@
+'''
+Self-balancing ordered index (AVL tree) to complement the build-once BinaryTree.
+
+Nodes use __slots__ and carry their subtree height and size, so insert, delete and search are
+O(log n), and order statistics (kthSmallest, rank) take one descent. fromSorted bulk-loads
+sorted input in O(n) by building the tree directly from midpoints.
+'''
+
+
+class AVLNode:
+    __slots__ = ("key", "value", "left", "right", "height", "size")
+
+    def __init__(self, key, value=None):
+        self.key = key
+        self.value = value
+        self.left = None
+        self.right = None
+        self.height = 1
+        self.size = 1
+
+
+def _height(node):
+    return node.height if node is not None else 0
+
+
+def _size(node):
+    return node.size if node is not None else 0
+
+
+def _update(node):
+    node.height = 1 + max(_height(node.left), _height(node.right))
+    node.size = 1 + _size(node.left) + _size(node.right)
+
+
+def _rotateRight(node):
+    pivot = node.left
+    node.left = pivot.right
+    pivot.right = node
+    _update(node)
+    _update(pivot)
+    return pivot
+
+
+def _rotateLeft(node):
+    pivot = node.right
+    node.right = pivot.left
+    pivot.left = node
+    _update(node)
+    _update(pivot)
+    return pivot
+
+
+def _rebalance(node):
+    _update(node)
+    balance = _height(node.left) - _height(node.right)
+    if balance > 1:
+        if _height(node.left.left) < _height(node.left.right):
+            node.left = _rotateLeft(node.left)
+        return _rotateRight(node)
+    if balance < -1:
+        if _height(node.right.right) < _height(node.right.left):
+            node.right = _rotateRight(node.right)
+        return _rotateLeft(node)
+    return node
+
+
+class AVLTree:
+    def __init__(self):
+        self.root = None
+
+    def __len__(self):
+        return _size(self.root)
+
+    def __contains__(self, key):
+        return self._find(key) is not None
+
+    def __iter__(self):
+        for key, _ in self.iterRange():
+            yield key
+
+    @classmethod
+    def fromSorted(cls, keys, values=None):
+        '''Builds a perfectly balanced tree from strictly increasing keys in O(n).'''
+        # Duplicate or unordered keys would break search, insert's value replacement and rank
+        for i in range(1, len(keys)):
+            if not keys[i - 1] < keys[i]:
+                raise ValueError(f"Keys must be strictly increasing: {keys[i - 1]!r} at {i - 1}, "
+                                 f"{keys[i]!r} at {i}")
+        tree = cls()
+
+        def build(lo, hi):
+            if lo >= hi:
+                return None
+            mid = (lo + hi) // 2
+            node = AVLNode(keys[mid], values[mid] if values is not None else None)
+            node.left = build(lo, mid)
+            node.right = build(mid + 1, hi)
+            _update(node)
+            return node
+
+        tree.root = build(0, len(keys))
+        return tree
+
+    def _find(self, key):
+        node = self.root
+        while node is not None:
+            if key < node.key:
+                node = node.left
+            elif node.key < key:
+                node = node.right
+            else:
+                return node
+        return None
+
+    def search(self, key, default=None):
+        node = self._find(key)
+        return node.value if node is not None else default
+
+    def insert(self, key, value=None):
+        '''Inserts key, or replaces its value if already present.'''
+        def _insert(node):
+            if node is None:
+                return AVLNode(key, value)
+            if key < node.key:
+                node.left = _insert(node.left)
+            elif node.key < key:
+                node.right = _insert(node.right)
+            else:
+                node.value = value
+                return node
+            return _rebalance(node)
+
+        self.root = _insert(self.root)
+
+    def delete(self, key):
+        '''Removes key; raises KeyError if it is not in the tree.'''
+        def _popMin(node):
+            if node.left is None:
+                return node.right, node
+            node.left, smallest = _popMin(node.left)
+            return _rebalance(node), smallest
+
+        def _delete(node):
+            if node is None:
+                raise KeyError(key)
+            if key < node.key:
+                node.left = _delete(node.left)
+            elif node.key < key:
+                node.right = _delete(node.right)
+            else:
+                if node.left is None:
+                    return node.right
+                if node.right is None:
+                    return node.left
+                right, successor = _popMin(node.right)
+                successor.left, successor.right = node.left, right
+                node = successor
+            return _rebalance(node)
+
+        self.root = _delete(self.root)
+
+    def kthSmallest(self, k):
+        '''Key at 0-based position k in sorted order.'''
+        if not 0 <= k < len(self):
+            raise IndexError(f"k={k} out of range for tree of size {len(self)}")
+        node = self.root
+        while True:
+            left_size = _size(node.left)
+            if k < left_size:
+                node = node.left
+            elif k == left_size:
+                return node.key
+            else:
+                k -= left_size + 1
+                node = node.right
+
+    def rank(self, key):
+        '''Number of keys strictly less than key.'''
+        count = 0
+        node = self.root
+        while node is not None:
+            if node.key < key:
+                count += _size(node.left) + 1
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+    def iterRange(self, lo=None, hi=None):
+        '''Yields (key, value) for lo <= key <= hi in order; None leaves that side open.'''
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                if lo is not None and node.key < lo:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            if hi is not None and hi < node.key:
+                return
+            yield node.key, node.value
+            node = node.right
+
+
+if __name__ == "__main__":
+    tree = AVLTree()
+    for key in [50, 20, 70, 10, 30, 60, 80, 25]:
+        tree.insert(key, f"value-{key}")
+    tree.delete(20)
+    print(list(tree))
+    print(tree.kthSmallest(2), tree.rank(60))
+    print(list(tree.iterRange(25, 60)))
+    assert list(tree) == sorted([50, 70, 10, 30, 60, 80, 25])
@@ -0,0 +1,90 @@
+'''
+AVLTree against a sorted Python list maintained with bisect, starting from a bulk-loaded index
+of 1M+ keys: bulk load, random inserts and deletes, point lookups, rank and range queries.
+'''
+
+import bisect
+import random
+import time
+
+from avl_tree import AVLTree
+
+NUM_KEYS = 1_000_000
+NUM_OPERATIONS = 50_000
+
+
+def timed(operation):
+    start = time.perf_counter()
+    operation()
+    return time.perf_counter() - start
+
+
+def run_benchmark(num_keys=NUM_KEYS, num_operations=NUM_OPERATIONS, seed=42):
+    rng = random.Random(seed)
+    # Even keys are loaded up front; odd keys are guaranteed fresh for the insert phase
+    keys = list(range(0, 2 * num_keys, 2))
+    new_keys = [2 * rng.randrange(num_keys) + 1 for _ in range(num_operations)]
+    lookups = [rng.randrange(2 * num_keys) for _ in range(num_operations)]
+    ranges = [(lo, lo + 200) for lo in lookups[:num_operations // 10]]
+
+    tree = None
+    sorted_list = None
+
+    def tree_load():
+        nonlocal tree
+        tree = AVLTree.fromSorted(keys)
+
+    def list_load():
+        nonlocal sorted_list
+        sorted_list = list(keys)
+
+    def list_insert():
+        for key in new_keys:
+            index = bisect.bisect_left(sorted_list, key)
+            if index == len(sorted_list) or sorted_list[index] != key:
+                sorted_list.insert(index, key)
+
+    def list_delete():
+        for key in new_keys:
+            index = bisect.bisect_left(sorted_list, key)
+            if index < len(sorted_list) and sorted_list[index] == key:
+                del sorted_list[index]
+
+    def tree_delete():
+        for key in set(new_keys):
+            tree.delete(key)
+
+    def list_range():
+        for lo, hi in ranges:
+            sorted_list[bisect.bisect_left(sorted_list, lo):bisect.bisect_right(sorted_list, hi)]
+
+    def tree_range():
+        for lo, hi in ranges:
+            list(tree.iterRange(lo, hi))
+
+    phases = [
+        ("bulk load", tree_load, list_load),
+        ("insert", lambda: [tree.insert(key) for key in new_keys], list_insert),
+        ("search", lambda: [key in tree for key in lookups],
+                   lambda: [bisect.bisect_left(sorted_list, key) for key in lookups]),
+        ("rank", lambda: [tree.rank(key) for key in lookups],
+                 lambda: [bisect.bisect_left(sorted_list, key) for key in lookups]),
+        ("range (200 wide)", tree_range, list_range),
+        ("delete", tree_delete, list_delete),
+    ]
+    results = []
+    for name, tree_operation, list_operation in phases:
+        results.append({
+            "operation": name,
+            "avl_seconds": timed(tree_operation),
+            "sorted_list_seconds": timed(list_operation),
+        })
+    assert list(tree) == sorted_list
+    return results
+
+
+if __name__ == "__main__":
+    print(f"{NUM_KEYS:,} keys, {NUM_OPERATIONS:,} operations per phase")
+    print(f"{'operation':<20}{'AVLTree':>12}{'bisect list':>14}")
+    for row in run_benchmark():
+        print(f"{row['operation']:<20}{row['avl_seconds']:>11.3f}s{row['sorted_list_seconds']:>13.3f}s")
@@ -1,73 +1,114 @@
+'''
+Complete binary tree stored implicitly in its level-order `values`: the children of index i
+are at 2i + 1 and 2i + 2, so no node objects are allocated and the tree costs nothing beyond
+the values array itself. Traversals walk indices with an explicit stack of depth log2(n), the
+iter* generators stream values without building lists, and inOrderIndices computes the whole
+in-order permutation with vectorized NumPy operations, a chunk of nodes at a time.
+'''
 
+import numpy as np
+
+# Nodes placed per vectorized pass in inOrderIndices; bounds the temporaries to a few MB
+CHUNK_SIZE = 1 << 16
 
-class Node:
-    def __init__(self, value):
-        self.value = value
-        self.left = None
-        self.right = None
 
 class BinaryTree:
     def __init__(self, values):
         self.values = values
-        self.root = self._createTree(0, len(values))
-    
-    def _createTree(self, i, n):
-        root = None
-        if i < n:
-            root = Node(self.values[i])
-            
-            root.left = self._createTree(i*2 + 1, n)
-            root.right = self._createTree(i*2 + 2, n)
-
-        
-        return root
+        self.size = len(values)
+
+    def left(self, i):
+        child = 2 * i + 1
+        return child if child < self.size else None
+
+    def right(self, i):
+        child = 2 * i + 2
+        return child if child < self.size else None
 
     def printTree(self):
-        def _printTree(node):
-            if node is not None:
-                _printTree(node.left)
-                print(node.value, end=' ')
-                _printTree(node.right)
-        
-        _printTree(self.root)
+        for value in self.iterInOrder():
+            print(value, end=' ')
         print()
 
+    def iterInOrder(self):
+        values, n = self.values, self.size
+        stack = []
+        i = 0
+        while stack or i < n:
+            while i < n:
+                stack.append(i)
+                i = 2 * i + 1
+            i = stack.pop()
+            yield values[i]
+            i = 2 * i + 2
+
+    def iterPreOrder(self):
+        values, n = self.values, self.size
+        stack = [0] if n else []
+        while stack:
+            i = stack.pop()
+            yield values[i]
+            if 2 * i + 2 < n:
+                stack.append(2 * i + 2)
+            if 2 * i + 1 < n:
+                stack.append(2 * i + 1)
+
+    def iterPostOrder(self):
+        values, n = self.values, self.size
+        stack = []
+        i, last = 0, -1
+        while stack or i < n:
+            if i < n:
+                stack.append(i)
+                i = 2 * i + 1
+                continue
+            top = stack[-1]
+            right = 2 * top + 2
+            if right < n and right != last:
+                i = right
+            else:
+                yield values[top]
+                last = stack.pop()
+                i = n
+
     def inOrder(self):
-        result = []
-        
-        def _inOrder(node):
-            if node is not None:
-                _inOrder(node.left)
-                result.append(node.value)
-                _inOrder(node.right)
-        
-        _inOrder(self.root)
-        return result
+        return list(self.iterInOrder())
 
     def preOrder(self):
-        result = []
-        
-        def _preOrder(node):
-            if node is not None:
-                result.append(node.value)
-                _preOrder(node.left)
-                _preOrder(node.right)
-        
-        _preOrder(self.root)
-        return result
-    
+        return list(self.iterPreOrder())
+
     def postOrder(self):
-        result = []
-        
-        def _postOrder(node):
-            if node is not None:
-                _postOrder(node.left)
-                _postOrder(node.right)
-                result.append(node.value)
-        
-        _postOrder(self.root)
-        return result
-    
+        return list(self.iterPostOrder())
+
+    def inOrderIndices(self):
+        '''
+        Level-order indices in in-order sequence, so values[inOrderIndices()] is the in-order
+        traversal. Each node's in-order position has a closed form in its depth and its offset
+        within the level, so the only full-size array is the returned one.
+        '''
+        n = self.size
+        order = np.empty(n, dtype=np.int64)
+        if n == 0:
+            return order
+        height = n.bit_length() - 1
+        # Nodes present on the last, possibly partial, level
+        last_level = n - (1 << height) + 1
+        for first in range(0, n, CHUNK_SIZE):
+            nodes = np.arange(first, min(first + CHUNK_SIZE, n), dtype=np.int64)
+            # frexp gives floor(log2(i + 1)) + 1 exactly for these integer indices
+            depth = np.frexp(nodes + 1)[1].astype(np.int64) - 1
+            offset = nodes + 1 - (1 << depth)
+            # Position in the perfect tree of this height, less the missing last-level slots before it
+            shift = height - depth
+            position = ((2 * offset + 1) << shift) - 1
+            leaves_before = np.where(shift > 0, (2 * offset + 1) << np.maximum(shift - 1, 0), offset)
+            position -= np.maximum(leaves_before - last_level, 0)
+            order[position] = nodes
+        return order
+
+    def inOrderArray(self):
+        return np.asarray(self.values)[self.inOrderIndices()]
+
 
 if __name__ == "__main__":
     values = [1, 2, 3, 4, 5, 6, 7]
@@ -0,0 +1,58 @@
+'''
+Lookup throughput of the batch searches against the standard bisect module (one query at a
+time) and np.searchsorted, over sorted arrays of growing size.
+'''
+
+import bisect
+import time
+
+import numpy as np
+
+from binary_search import batch_bisect, EytzingerIndex
+
+ARRAY_SIZES = [1_000, 100_000, 10_000_000]
+NUM_QUERIES = 1_000_000
+
+
+def queries_per_second(search, queries, repeats=3):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        search(queries)
+        best = min(best, time.perf_counter() - start)
+    return len(queries) / best
+
+
+def run_benchmark(array_sizes=ARRAY_SIZES, num_queries=NUM_QUERIES, seed=42):
+    rng = np.random.default_rng(seed)
+    results = []
+    for n in array_sizes:
+        arr = np.sort(rng.integers(0, 10 * n, n))
+        queries = rng.integers(0, 10 * n, num_queries)
+
+        start = time.perf_counter()
+        index = EytzingerIndex(arr)
+        build_seconds = time.perf_counter() - start
+
+        # bisect on a Python list, the way a per-query loop would call it
+        arr_list = arr.tolist()
+        query_list = queries.tolist()
+        searches = {
+            "bisect (per query)": lambda _: [bisect.bisect_left(arr_list, x) for x in query_list],
+            "np.searchsorted": lambda q: np.searchsorted(arr, q),
+            "batch_bisect": lambda q: batch_bisect(arr, q),
+            "eytzinger batch": index.search_batch,
+        }
+        for name, search in searches.items():
+            results.append({
+                "n": n,
+                "method": name,
+                "queries_per_second": queries_per_second(search, queries),
+            })
+        print(f"n={n:,}: Eytzinger layout built in {build_seconds:.3f}s")
+    return results
+
+
+if __name__ == "__main__":
+    for row in run_benchmark():
+        print(f"{row['n']:>12,}  {row['method']:<20}{row['queries_per_second']:>16,.0f} queries/s")
@@ -1,26 +1,151 @@
 '''
 This is an implementation of binary search algorithm in python
+
+Scalar bisect_left/bisect_right follow the semantics of the standard bisect module. The batch
+functions search a whole NumPy array of queries at once: every query advances one level per
+step in lockstep, with the branch replaced by np.where, so millions of lookups cost log2(n)
+vectorized passes. EytzingerIndex stores the sorted values in BFS (heap) order, which keeps the
+first levels of every search in the same few cache lines.
 '''
 
+import numpy as np
+
 data = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
 
-def binary_search(arr, target):
-    left = 0
-    right = len(arr) - 1
-
-    while left != right:
-        mid = (left+right) // 2
-        if arr[mid] == target:
-            return mid
-        elif mid < target:
-            left = mid + 1
+
+def bisect_left(arr, target, lo=0, hi=None):
+    if hi is None:
+        hi = len(arr)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if arr[mid] < target:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+def bisect_right(arr, target, lo=0, hi=None):
+    if hi is None:
+        hi = len(arr)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if target < arr[mid]:
+            hi = mid
         else:
-            right = mid + 1
+            lo = mid + 1
+    return lo
+
+
+def binary_search(arr, target):
+    index = bisect_left(arr, target)
+    if index < len(arr) and arr[index] == target:
+        return index
     return -1
 
 
+def batch_bisect(arr, queries, side="left"):
+    '''Vectorized bisect over a sorted NumPy array; matches np.searchsorted(arr, queries, side).'''
+    arr = np.asarray(arr)
+    queries = np.asarray(queries)
+    n = len(arr)
+    if side == "left":
+        goes_right = np.less
+    elif side == "right":
+        goes_right = np.less_equal
+    else:
+        raise ValueError(f"Unknown side: {side!r} (expected 'left' or 'right')")
+    if n == 0:
+        return np.zeros(queries.shape, dtype=np.intp)
+
+    # Every query keeps the same remaining length, so base + half is always in bounds
+    base = np.zeros(queries.shape, dtype=np.intp)
+    length = n
+    while length > 1:
+        half = length // 2
+        probe = base + half
+        base = np.where(goes_right(arr[probe], queries), probe, base)
+        length -= half
+    return base + goes_right(arr[base], queries)
+
+
+def batch_binary_search(arr, queries):
+    '''Index of each query in the sorted `arr`, or -1 where it is absent.'''
+    arr = np.asarray(arr)
+    queries = np.asarray(queries)
+    # Work on at least one dimension so the masks below can be assigned into, even for a scalar
+    flat_queries = np.atleast_1d(queries)
+    index = batch_bisect(arr, flat_queries, side="left")
+    found = index < len(arr)
+    found[found] = arr[index[found]] == flat_queries[found]
+    return np.where(found, index, -1).reshape(queries.shape)
+
+
+def _subtree_sizes(nodes, n):
+    # Size of the subtree rooted at each 1-based heap index in a complete tree of n nodes
+    sizes = np.zeros(nodes.shape, dtype=np.int64)
+    first, width = nodes.astype(np.int64), 1
+    while True:
+        level = np.clip(np.minimum(first + width - 1, n) - first + 1, 0, None)
+        if not level.any():
+            return sizes
+        sizes += level
+        first, width = first * 2, width * 2
+
+
+def eytzinger_order(n):
+    '''
+    Sorted-order position of every node of a complete binary tree with n nodes in heap layout
+    (root at 1, children of k at 2k and 2k + 1), computed one tree level at a time.
+    '''
+    rank = np.zeros(n + 1, dtype=np.int64)
+    level, start = np.array([1] if n else [], dtype=np.int64), np.array([0] if n else [], dtype=np.int64)
+    while len(level):
+        left_sizes = _subtree_sizes(2 * level, n)
+        rank[level] = start + left_sizes
+        children = np.concatenate([2 * level, 2 * level + 1])
+        child_starts = np.concatenate([start, start + left_sizes + 1])
+        keep = children <= n
+        level, start = children[keep], child_starts[keep]
+    return rank
+
+
+class EytzingerIndex:
+    '''
+    Sorted values re-laid out in BFS order, built once. bisect_left/search_batch return
+    positions in the original sorted array.
+    '''
+
+    def __init__(self, sorted_values):
+        sorted_values = np.asarray(sorted_values)
+        self.n = len(sorted_values)
+        self.rank = eytzinger_order(self.n)
+        self.layout = np.empty(self.n + 1, dtype=sorted_values.dtype)
+        self.layout[1:] = sorted_values[self.rank[1:]]
+        # Index n means "past the end"; descents that end off the tree map to it
+        self.rank[0] = self.n
+        self.depth = self.n.bit_length()
+
+    def bisect_left(self, target):
+        k = 1
+        while k <= self.n:
+            k = 2 * k + int(self.layout[k] < target)
+        # Undo the trailing right turns plus the last left turn to land on the lower bound
+        k >>= ((~k) & (k + 1)).bit_length()
+        return int(self.rank[k])
+
+    def search_batch(self, queries):
+        queries = np.asarray(queries)
+        k = np.ones(queries.shape, dtype=np.int64)
+        for _ in range(self.depth):
+            inside = k <= self.n
+            k = np.where(inside, 2 * k + (self.layout[np.minimum(k, self.n)] < queries), k)
+        k //= 2 * ((~k) & (k + 1))
+        return self.rank[k]
+
+
 if __name__ == "__main__":
     target = 7
     result = binary_search(data, target)
     print(f"Element {target} found at index: {result}")
-    assert result == data.index(target)
\ No newline at end of file
+    assert result == data.index(target)
@@ -0,0 +1,198 @@
+'''
+Benchmark harness for every sort in this directory.
+
+Each `*_sort` function found in the sibling modules, plus the `sorted` and `np.sort` baselines,
+is timed over growing input sizes and several input distributions. Peak memory is measured in a
+separate tracemalloc run so it doesn't distort the timings; tracing slows the pure-Python sorts
+by an order of magnitude, so that run happens once per algorithm and distribution at a small
+size and is reported per element. A log-log fit of time against n gives the empirical
+complexity exponent. Results are written as JSON and can be compared against a saved baseline
+to flag regressions.
+
+    python DSA/Sorting_Algorithms/benchmark_sorts.py --output results.json --baseline baseline.json
+'''
+
+import argparse
+import importlib
+import inspect
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+SORT_DIR = os.path.dirname(os.path.abspath(__file__))
+SIZES = [1_000, 4_000, 16_000, 64_000, 256_000, 1_000_000]
+DISTRIBUTIONS = ["random", "sorted", "reversed", "few_unique", "wide_range"]
+MEMORY_SIZE = 1_000
+
+
+def make_input(distribution, n, seed=42):
+    rng = np.random.default_rng(seed)
+    if distribution == "random":
+        values = rng.integers(0, n, n)
+    elif distribution == "sorted":
+        values = np.sort(rng.integers(0, n, n))
+    elif distribution == "reversed":
+        values = np.sort(rng.integers(0, n, n))[::-1]
+    elif distribution == "few_unique":
+        values = rng.integers(0, 8, n)
+    elif distribution == "wide_range":
+        values = rng.integers(-2**31, 2**31, n)
+    else:
+        raise ValueError(f"Unknown distribution: {distribution!r}")
+    return values.tolist()
+
+
+def discover_sorts():
+    if SORT_DIR not in sys.path:
+        sys.path.insert(0, SORT_DIR)
+    sorts = {
+        "sorted": sorted,
+        "np.sort": lambda values: np.sort(np.asarray(values)),
+    }
+    this_module = os.path.splitext(os.path.basename(__file__))[0]
+    for filename in sorted(os.listdir(SORT_DIR)):
+        module_name, extension = os.path.splitext(filename)
+        if extension != ".py" or module_name == this_module:
+            continue
+        module = importlib.import_module(module_name)
+        for name, function in inspect.getmembers(module, inspect.isfunction):
+            if name.endswith("_sort") and not name.startswith("_") and function.__module__ == module_name:
+                sorts[name] = function
+    return sorts
+
+
+def time_sort(sort, values, repeats):
+    # The in-place sorts here consume or reorder their input, so every repeat gets a fresh copy
+    best = float("inf")
+    for _ in range(repeats):
+        data = list(values)
+        start = time.perf_counter()
+        sort(data)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(sort, values):
+    data = list(values)
+    tracemalloc.start()
+    try:
+        sort(data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def fit_exponent(sizes, seconds):
+    # Sub-millisecond timings are dominated by overhead and flatten the slope, so leave them out
+    points = [(n, t) for n, t in zip(sizes, seconds) if t > 1e-3]
+    if len(points) < 2:
+        return None
+    n, t = np.log(np.array(points)).T
+    return float(np.polyfit(n, t, 1)[0])
+
+
+def run_benchmarks(sizes=SIZES, distributions=DISTRIBUTIONS, repeats=3, max_seconds=2.0, only=None,
+                   memory_size=MEMORY_SIZE):
+    '''
+    Returns the raw runs, the fitted exponents and the peak memory measured at `memory_size`.
+    Once a run of an algorithm takes longer than `max_seconds`, larger sizes for that algorithm
+    and distribution are skipped, which keeps the quadratic sorts from dominating the suite.
+    '''
+    runs, exponents, memory = [], [], []
+    for name, sort in discover_sorts().items():
+        if only and name not in only:
+            continue
+        for distribution in distributions:
+            peak_bytes = peak_memory(sort, make_input(distribution, memory_size))
+            memory.append({
+                "algorithm": name,
+                "distribution": distribution,
+                "n": memory_size,
+                "peak_bytes": peak_bytes,
+                "bytes_per_element": peak_bytes / memory_size
+            })
+            measured_sizes, measured_seconds = [], []
+            for n in sizes:
+                values = make_input(distribution, n)
+                seconds = time_sort(sort, values, repeats)
+                runs.append({
+                    "algorithm": name,
+                    "distribution": distribution,
+                    "n": n,
+                    "seconds": seconds
+                })
+                measured_sizes.append(n)
+                measured_seconds.append(seconds)
+                print(f"{name:<16}{distribution:<12}{n:>10,}{seconds:>12.5f}s")
+                if seconds > max_seconds:
+                    break
+            exponents.append({
+                "algorithm": name,
+                "distribution": distribution,
+                "exponent": fit_exponent(measured_sizes, measured_seconds)
+            })
+    return runs, exponents, memory
+
+
+def find_regressions(runs, baseline_runs, threshold=0.25, min_seconds=1e-3):
+    # Timings below min_seconds are mostly noise and would be flagged on every run
+    baseline = {(r["algorithm"], r["distribution"], r["n"]): r["seconds"] for r in baseline_runs}
+    regressions = []
+    for run in runs:
+        previous = baseline.get((run["algorithm"], run["distribution"], run["n"]))
+        if previous is None or previous < min_seconds:
+            continue
+        if run["seconds"] > previous * (1 + threshold):
+            regressions.append({**run, "baseline_seconds": previous, "slowdown": run["seconds"] / previous})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the sorts in DSA/Sorting_Algorithms")
+    parser.add_argument("--output", default="sort_benchmark.json")
+    parser.add_argument("--baseline", help="previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before flagging")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--distributions", nargs="+", default=DISTRIBUTIONS)
+    parser.add_argument("--only", nargs="+", help="algorithm names to run")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--max-seconds", type=float, default=2.0)
+    parser.add_argument("--memory-size", type=int, default=MEMORY_SIZE, help="input size for the tracemalloc run")
+    args = parser.parse_args()
+
+    runs, exponents, memory = run_benchmarks(args.sizes, args.distributions, args.repeats, args.max_seconds,
+                                             args.only, args.memory_size)
+
+    print(f"\nPeak memory at n={args.memory_size:,}:")
+    for row in memory:
+        print(f"  {row['algorithm']:<16}{row['distribution']:<12}{row['peak_bytes']:>12,} B"
+              f"{row['bytes_per_element']:>10.1f} B/element")
+
+    print("\nEmpirical complexity exponents (time ~ n^k):")
+    for row in exponents:
+        exponent = "n/a" if row["exponent"] is None else f"{row['exponent']:.2f}"
+        print(f"  {row['algorithm']:<16}{row['distribution']:<12}{exponent:>6}")
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(runs, json.load(f)["runs"], args.threshold)
+        for row in regressions:
+            print(f"⚠️  Regression: {row['algorithm']} {row['distribution']} n={row['n']:,} "
+                  f"{row['baseline_seconds']:.5f}s -> {row['seconds']:.5f}s ({row['slowdown']:.2f}x)")
+        if not regressions:
+            print(f"✅ No regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+    with open(args.output, "w") as f:
+        json.dump({"runs": runs, "exponents": exponents, "memory": memory, "regressions": regressions}, f, indent=2)
+    print(f"✅ Results saved to: {args.output}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
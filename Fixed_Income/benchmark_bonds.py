@@ -0,0 +1,83 @@
+'''
+Revaluation throughput of BondPortfolio against a per-bond Python loop over the same
+cash flows, for a randomly generated book under a grid of parallel yield shocks.
+'''
+
+import time
+
+import numpy as np
+
+from bond_analytics import BondPortfolio, make_portfolio
+
+NUM_BONDS = 100_000
+NUM_SCENARIOS = 100
+LOOP_BONDS = 1_000
+
+
+def random_portfolio(num_bonds, seed=42):
+    rng = np.random.default_rng(seed)
+    return make_portfolio(
+        face=rng.choice([100.0, 1_000.0], num_bonds),
+        coupon_rate=rng.uniform(0.0, 0.10, num_bonds),
+        frequency=rng.choice([1, 2, 4, 12], num_bonds, p=[0.3, 0.5, 0.15, 0.05]),
+        maturity=rng.uniform(0.5, 30.0, num_bonds),
+    ), rng.uniform(0.01, 0.08, num_bonds)
+
+
+def price_loop(bonds, yields):
+    # One bond and one yield at a time, straight from the formula in bonds.md
+    prices = []
+    for bond, y in zip(bonds, yields):
+        frequency = int(bond["frequency"])
+        periods = max(int(round(bond["maturity"] * frequency)), 1)
+        coupon = bond["face"] * bond["coupon_rate"] / frequency
+        price = 0.0
+        for k in range(1, periods + 1):
+            cash_flow = coupon + (bond["face"] if k == periods else 0.0)
+            price += cash_flow / (1 + y / frequency) ** k
+        prices.append(price)
+    return prices
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def run_benchmark(num_bonds=NUM_BONDS, num_scenarios=NUM_SCENARIOS, loop_bonds=LOOP_BONDS):
+    bonds, yields = random_portfolio(num_bonds)
+    shocks = np.linspace(-0.02, 0.02, num_scenarios)
+
+    portfolio, build_seconds = timed(lambda: BondPortfolio(bonds))
+    revalued, revalue_seconds = timed(lambda: portfolio.revalue(yields, shocks))
+    measures, risk_seconds = timed(lambda: portfolio.risk_measures(yields))
+    ytm, ytm_seconds = timed(lambda: portfolio.yield_to_maturity(measures["price"]))
+
+    # The loop is far too slow for the full book; time a slice and scale up
+    subset = slice(0, loop_bonds)
+    loop_prices, loop_seconds = timed(lambda: [
+        price_loop(bonds[subset], yields[subset] + shock) for shock in shocks
+    ])
+    loop_seconds *= num_bonds / loop_bonds
+    max_error = np.abs(np.array(loop_prices).T - revalued[subset]).max()
+
+    valuations = num_bonds * num_scenarios
+    print(f"{num_bonds:,} bonds x {num_scenarios} scenarios")
+    print(f"  schedules built:        {build_seconds:>10.3f}s")
+    print(f"  revalue (vectorized):   {revalue_seconds:>10.3f}s  {valuations / revalue_seconds:>14,.0f} prices/s")
+    print(f"  revalue (loop, scaled): {loop_seconds:>10.3f}s  {valuations / loop_seconds:>14,.0f} prices/s")
+    print(f"  speedup:                {loop_seconds / revalue_seconds:>10.1f}x  (max price difference {max_error:.2e})")
+    print(f"  risk measures:          {risk_seconds:>10.3f}s")
+    print(f"  yield to maturity:      {ytm_seconds:>10.3f}s  (max error {np.abs(ytm - yields).max():.2e})")
+    return {
+        "build_seconds": build_seconds,
+        "revalue_seconds": revalue_seconds,
+        "loop_seconds": loop_seconds,
+        "risk_seconds": risk_seconds,
+        "ytm_seconds": ytm_seconds,
+    }
+
+
+if __name__ == "__main__":
+    run_benchmark()
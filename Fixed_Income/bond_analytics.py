@@ -0,0 +1,237 @@
+"""
+Vectorized Bond Analytics
+
+Prices, yields-to-maturity, Macaulay/modified duration and convexity for a whole book of
+fixed-coupon bonds at once (see Financial_Learnings/bonds.md and duration_convexity.md).
+
+A portfolio is a structured array of BOND_DTYPE. BondPortfolio turns it into cash-flow
+schedules once; every later pricing call, under any number of yield scenarios, only has to
+compute discount factors and contract them against those schedules. Bonds are valued on a
+coupon date, so there is no accrued interest.
+"""
+
+import os
+import sys
+import warnings
+
+import numpy as np
+from typing import Dict, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from instrumentation import span, traced
+
+
+BOND_DTYPE = np.dtype([
+    ("face", np.float64),
+    ("coupon_rate", np.float64),  # annual, e.g. 0.05 for 5%
+    ("frequency", np.int64),      # coupon payments per year
+    ("maturity", np.float64),     # years to maturity
+])
+
+# Bonds per schedule block; blocks hold bonds of similar length so padding stays small
+BLOCK_ROWS = 4_096
+# Upper bound on the discount-factor temporaries (bonds x scenarios x periods) per step
+MAX_BLOCK_ELEMENTS = 2_000_000
+
+
+def make_portfolio(face, coupon_rate, frequency, maturity) -> np.ndarray:
+    face, coupon_rate, frequency, maturity = np.broadcast_arrays(face, coupon_rate, frequency, maturity)
+    portfolio = np.empty(face.shape, dtype=BOND_DTYPE)
+    portfolio["face"] = face
+    portfolio["coupon_rate"] = coupon_rate
+    portfolio["frequency"] = frequency
+    portfolio["maturity"] = maturity
+    return portfolio
+
+
+def approximate_ytm(face, coupon_rate, price, maturity):
+    # YTM = [C + (FV - PV) / t] / [(FV + PV) / 2], the approximation from bonds.md
+    coupon = face * coupon_rate
+    return (coupon + (face - price) / maturity) / ((face + price) / 2)
+
+
+def approximate_price_change(modified_duration, convexity, yield_change):
+    # dP/P ~ -D_mod * dy + 1/2 * Convexity * dy^2
+    return -modified_duration * yield_change + 0.5 * convexity * yield_change ** 2
+
+
+class BondPortfolio:
+
+    def __init__(self, bonds: np.ndarray):
+        bonds = np.asarray(bonds)
+        if bonds.dtype != BOND_DTYPE:
+            raise TypeError(f"Expected a structured array of BOND_DTYPE, got dtype {bonds.dtype}")
+        bonds = bonds.ravel()
+        if np.any(bonds["frequency"] < 1) or np.any(bonds["maturity"] <= 0) or np.any(bonds["face"] <= 0):
+            raise ValueError("Bonds need frequency >= 1, maturity > 0 and face > 0")
+
+        self.bonds = bonds
+        self.periods = np.maximum(np.rint(bonds["maturity"] * bonds["frequency"]).astype(np.int64), 1)
+        with span("bonds.build_schedules", bonds=len(bonds)):
+            self.blocks = self._build_schedules()
+
+    def __len__(self) -> int:
+        return len(self.bonds)
+
+    def _build_schedules(self):
+        # Sorting by number of periods keeps bonds of similar length in the same block
+        order = np.argsort(self.periods, kind="stable")
+        blocks = []
+        for start in range(0, len(order), BLOCK_ROWS):
+            index = order[start:start + BLOCK_ROWS]
+            bonds = self.bonds[index]
+            periods = self.periods[index]
+            k = np.arange(1, periods.max() + 1, dtype=np.float64)
+
+            coupon = bonds["face"] * bonds["coupon_rate"] / bonds["frequency"]
+            cash_flows = np.where(k <= periods[:, None], coupon[:, None], 0.0)
+            cash_flows[np.arange(len(index)), periods - 1] += bonds["face"]
+
+            # Columns: CF_k, k * CF_k, k(k+1) * CF_k -- the sums behind price, duration and
+            # convexity all reduce to these weights dotted with the discount factors
+            weights = np.stack([cash_flows, k * cash_flows, k * (k + 1) * cash_flows], axis=2)
+            blocks.append({
+                "index": index,
+                "periods": periods,
+                "frequency": bonds["frequency"].astype(np.float64),
+                "k": k,
+                "weights": weights,
+            })
+        return blocks
+
+    def _as_scenarios(self, yields) -> Tuple[np.ndarray, bool]:
+        # Returns (bonds, scenarios) yields and whether the caller passed a single scenario
+        yields = np.asarray(yields, dtype=np.float64)
+        if yields.ndim == 2:
+            return np.broadcast_to(yields, (len(self), yields.shape[1])), False
+        return np.broadcast_to(yields, (len(self),))[:, None], True
+
+    def _moments(self, yields: np.ndarray, orders: int) -> np.ndarray:
+        '''
+        Discounted sums sum_k W_k * (1 + y/f)^-k for the first `orders` weight columns, for
+        yields shaped (bonds, scenarios). Returns (bonds, scenarios, orders).
+        '''
+        n_scenarios = yields.shape[1]
+        out = np.empty((len(self), n_scenarios, orders))
+        for block in self.blocks:
+            index, periods, k = block["index"], block["periods"], block["k"]
+            log_discount = -np.log1p(yields[index] / block["frequency"][:, None])
+
+            step = max(1, MAX_BLOCK_ELEMENTS // (n_scenarios * len(k)))
+            for start in range(0, len(index), step):
+                rows = slice(start, start + step)
+                # Rows are sorted by length, so the last one bounds the columns this step needs
+                width = periods[rows][-1]
+                discount = np.exp(log_discount[rows, :, None] * k[:width])
+                out[index[rows]] = discount @ block["weights"][rows, :width, :orders]
+        return out
+
+    @traced("bonds.price")
+    def price(self, yields) -> np.ndarray:
+        '''
+        Prices at annual yields given per bond (bonds,) or per bond and scenario
+        (bonds, scenarios); a scalar applies one yield to every bond.
+        '''
+        yields, single = self._as_scenarios(yields)
+        prices = self._moments(yields, 1)[:, :, 0]
+        return prices[:, 0] if single else prices
+
+    @traced("bonds.risk_measures")
+    def risk_measures(self, yields) -> Dict[str, np.ndarray]:
+        yields, single = self._as_scenarios(yields)
+        moments = self._moments(yields, 3)
+        price, weighted_time, weighted_convexity = moments[..., 0], moments[..., 1], moments[..., 2]
+
+        frequency = self.bonds["frequency"][:, None].astype(np.float64)
+        growth = 1 + yields / frequency
+        # Sums run over coupon periods; dividing by the frequency converts them to years
+        macaulay = weighted_time / price / frequency
+        results = {
+            "price": price,
+            "macaulay_duration": macaulay,
+            "modified_duration": macaulay / growth,
+            "convexity": weighted_convexity / (price * growth ** 2 * frequency ** 2),
+        }
+        if single:
+            results = {name: values[:, 0] for name, values in results.items()}
+        return results
+
+    @traced("bonds.yield_to_maturity")
+    def yield_to_maturity(self, prices, tol: float = 1e-10, max_iter: int = 50) -> np.ndarray:
+        '''
+        Solves price(y) = prices for every bond at once with Newton's method, starting from the
+        approximate YTM. Bonds that fail to converge come back as NaN with a RuntimeWarning.
+        '''
+        prices = np.broadcast_to(np.asarray(prices, dtype=np.float64), (len(self),))
+        bonds = self.bonds
+        frequency = bonds["frequency"].astype(np.float64)
+        yields = approximate_ytm(bonds["face"], bonds["coupon_rate"], prices, bonds["maturity"])
+
+        converged = np.zeros(len(self), dtype=bool)
+        # Prices with no solution send the step or the yield off to inf/NaN; such bonds are frozen
+        diverged = np.zeros(len(self), dtype=bool)
+        for _ in range(max_iter):
+            with np.errstate(over="ignore", divide="ignore", invalid="ignore"):
+                moments = self._moments(yields[:, None], 2)[:, 0]
+                # dP/dy = -sum(k * CF_k * v^(k+1)) / f
+                slope = -moments[:, 1] / (1 + yields / frequency) / frequency
+                step = (moments[:, 0] - prices) / slope
+                diverged |= ~np.isfinite(step)
+                step[converged | diverged] = 0.0
+                # Keep 1 + y/f positive so the discount factors stay defined
+                yields = np.maximum(yields - step, -0.99 * frequency)
+            diverged |= ~np.isfinite(yields)
+            converged |= ~diverged & (np.abs(step) < tol)
+            if (converged | diverged).all():
+                break
+
+        if not converged.all():
+            warnings.warn(f"YTM did not converge for {np.count_nonzero(~converged)} bonds", RuntimeWarning)
+            yields = np.where(converged, yields, np.nan)
+        return yields
+
+    @traced("bonds.revalue")
+    def revalue(self, yields, shocks) -> np.ndarray:
+        '''
+        Prices under parallel yield shocks: returns (bonds, scenarios) for shocks (scenarios,)
+        added to each bond's yield.
+        '''
+        yields = np.broadcast_to(np.asarray(yields, dtype=np.float64), (len(self),))
+        shocks = np.atleast_1d(np.asarray(shocks, dtype=np.float64))
+        return self.price(yields[:, None] + shocks[None, :])
+
+
+def example_portfolio():
+    print("\n" + "="*70)
+    print("EXAMPLE: BOND ANALYTICS")
+    print("="*70)
+
+    portfolio = BondPortfolio(make_portfolio(
+        face=[1000, 1000, 1000, 1000],
+        coupon_rate=[0.10, 0.05, 0.0, 0.07],
+        frequency=[1, 2, 1, 4],
+        maturity=[10, 5, 10, 30],
+    ))
+    yields = np.array([0.05, 0.05, 0.05, 0.06])
+    measures = portfolio.risk_measures(yields)
+
+    print(f"{'Bond':<6}{'Price':>12}{'YTM':>10}{'Macaulay':>11}{'Modified':>11}{'Convexity':>12}")
+    ytm = portfolio.yield_to_maturity(measures["price"])
+    for i in range(len(portfolio)):
+        print(f"{i:<6}{measures['price'][i]:>12,.2f}{ytm[i]*100:>9.2f}%{measures['macaulay_duration'][i]:>11.2f}"
+              f"{measures['modified_duration'][i]:>11.2f}{measures['convexity'][i]:>12.2f}")
+
+    shocks = np.array([-0.01, 0.01])
+    revalued = portfolio.revalue(yields, shocks)
+    estimated = measures["price"][:, None] * (1 + approximate_price_change(
+        measures["modified_duration"][:, None], measures["convexity"][:, None], shocks))
+    print("\n+/-100bp shock, full revaluation vs duration + convexity estimate:")
+    print(f"{'Bond':<6}{'-100bp':>12}{'estimate':>12}{'+100bp':>14}{'estimate':>12}")
+    for i in range(len(portfolio)):
+        print(f"{i:<6}{revalued[i, 0]:>12,.2f}{estimated[i, 0]:>12,.2f}{revalued[i, 1]:>14,.2f}{estimated[i, 1]:>12,.2f}")
+
+    return portfolio
+
+
+if __name__ == "__main__":
+    example_portfolio()
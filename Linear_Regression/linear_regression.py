@@ -1,8 +1,14 @@
+import os
+import sys
+
 import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 from typing import Tuple, List
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from instrumentation import count, traced
+from rendering import downsample, render
+
 
 
 def compute_gradients(x: np.ndarray, y: np.ndarray, m: float, b: float) -> Tuple[float, float]:
@@ -14,6 +20,7 @@ def compute_gradients(x: np.ndarray, y: np.ndarray, m: float, b: float) -> Tuple
     return dm, db
 
 
+@traced("linear_regression.gradient_descent")
 def gradient_descent(
     x: np.ndarray, y: np.ndarray, learning_rate: float = 1e-4, epochs: int = 20_000
 ) -> Tuple[float, float, List[float]]:
@@ -30,6 +37,7 @@ def gradient_descent(
         m -= learning_rate * dm
         b -= learning_rate * db
 
+    count("linear_regression.epochs", epochs)
     return m, b, cost_history
 
 
@@ -38,22 +46,28 @@ def plot_results(x: np.ndarray, y: np.ndarray, m: float, b: float, cost_history:
     x_sorted = x[sort_idx]
     y_pred_sorted = m * x_sorted + b
 
-    plt.figure(figsize=(8, 5))
-    plt.scatter(x, y, color="blue", label="Data Points")
-    plt.plot(x_sorted, y_pred_sorted, color="red", label="Best Fit Line", linewidth=2)
-    plt.title("Years of Experience vs. Salary (Gradient Descent)")
-    plt.xlabel("Years of Experience")
-    plt.ylabel("Salary")
-    plt.legend()
-    plt.show()
-
-    plt.figure(figsize=(8, 4))
-    plt.plot(cost_history, color="purple")
-    plt.title("Cost Function (MSE) Over Iterations")
-    plt.xlabel("Iteration")
-    plt.ylabel("Mean Squared Error")
-    plt.show()
+    def draw_fit(figure):
+        ax = figure.subplots()
+        ax.scatter(x, y, color="blue", label="Data Points")
+        ax.plot(x_sorted, y_pred_sorted, color="red", label="Best Fit Line", linewidth=2)
+        ax.set_title("Years of Experience vs. Salary (Gradient Descent)")
+        ax.set_xlabel("Years of Experience")
+        ax.set_ylabel("Salary")
+        ax.legend()
+
+    iterations, costs = downsample(cost_history)
+
+    def draw_cost(figure):
+        ax = figure.subplots()
+        ax.plot(iterations, costs, color="purple")
+        ax.set_title("Cost Function (MSE) Over Iterations")
+        ax.set_xlabel("Iteration")
+        ax.set_ylabel("Mean Squared Error")
+
+    render(draw_fit, "linear_regression_fit", figsize=(8, 5))
+    render(draw_cost, "linear_regression_cost", figsize=(8, 4))
 
+@traced("linear_regression.predict")
 def predict(x_new: np.ndarray, m: float, b: float) -> np.ndarray:
     return m * x_new + b
 
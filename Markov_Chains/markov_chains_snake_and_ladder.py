@@ -2,10 +2,16 @@
 this module implements a Markov Chain model for the classic Snake and Ladder game.
 '''
 
+import os
+import sys
+
 import numpy as np
 import random
 from enum import Enum
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from instrumentation import observe, traced
+
 
 class CellType(Enum):
     NORMAL = 0
@@ -46,12 +52,14 @@ class SnakeAndLadderMarkovChain:
                 break
         return self.current_position
     
+    @traced("snake_and_ladder.simulate_game")
     def simulate_game(self):
         self.current_position = 0
         moves = 0
         while self.current_position < self.board_size:
             self.next_move()
             moves += 1
+        observe("snake_and_ladder.moves", moves)
         return moves
     
 if __name__ == "__main__":
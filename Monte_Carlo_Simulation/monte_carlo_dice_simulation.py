@@ -1,8 +1,15 @@
 '''
 I want to know how many times I can get a sum of {x} when rolling a pair of dice {y} times.
 '''
+import os
+import sys
+
 import numpy as np
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from instrumentation import traced
+
+@traced("monte_carlo.dice_sum")
 def monte_carlo_dice_sum_simulation(num_simulations, target_sum) -> int:
     count_target_sum = 0
 
@@ -15,6 +22,7 @@ def monte_carlo_dice_sum_simulation(num_simulations, target_sum) -> int:
     return (count_target_sum * 100) / num_simulations
 
 
+@traced("monte_carlo.dice_double")
 def monte_carlo_dice_double_simulation(num_simulations) -> int:
     count_double = 0
 
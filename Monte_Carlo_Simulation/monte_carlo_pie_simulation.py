@@ -1,13 +1,27 @@
+import os
+import sys
+
 import numpy as np
 
-num_simulations = 1_000_000  # number of random points
-inside_circle = 0
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from instrumentation import count, traced
+
+
+@traced("monte_carlo.pi")
+def monte_carlo_pi_simulation(num_simulations):
+    inside_circle = 0
+
+    for _ in range(num_simulations):
+        x = np.random.uniform(-1, 1)
+        y = np.random.uniform(-1, 1)
+        if x**2 + y**2 <= 1:
+            inside_circle += 1
+    count("monte_carlo.pi.points", num_simulations)
+
+    return (inside_circle / num_simulations) * 4
 
-for _ in range(num_simulations):
-    x = np.random.uniform(-1, 1)
-    y = np.random.uniform(-1, 1)
-    if x**2 + y**2 <= 1:
-        inside_circle += 1
 
-pi_estimate = (inside_circle / num_simulations) * 4
-print(f"Estimated value of pi after {num_simulations} simulations: {pi_estimate}")
+if __name__ == "__main__":
+    num_simulations = 1_000_000  # number of random points
+    pi_estimate = monte_carlo_pi_simulation(num_simulations)
+    print(f"Estimated value of pi after {num_simulations} simulations: {pi_estimate}")
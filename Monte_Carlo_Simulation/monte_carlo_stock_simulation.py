@@ -2,33 +2,59 @@
 I will be simulating stock prices using the Monte Carlo method.
 '''
 
+import os
+import sys
+
 import numpy as np
-import yfinance as yf
-import matplotlib.pyplot as plt
 
-def monte_carlo_stock_simulation(ticker, num_simulation, num_days):
-    data = yf.download(ticker, start="2020-01-01", end="2025-01-01")
-    avg_daily_return = data["Close"].pct_change().mean()
-    daily_volatility = data["Close"].pct_change().std()
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from instrumentation import span, traced
+from rendering import downsample, render
+
+@traced("monte_carlo.stock.simulate")
+def simulate_stock_prices(close_prices, num_simulation, num_days, price_paths=None):
+    avg_daily_return = close_prices.pct_change().mean()
+    daily_volatility = close_prices.pct_change().std()
 
     average_predected_price_per_simulation = []
 
     for sim in range(num_simulation):
-        price_series = [data["Close"].iloc[-1]]
+        price_series = [close_prices.iloc[-1]]
         for day in range(num_days):
             shock = np.random.normal(loc=avg_daily_return, scale=daily_volatility)
             price = price_series[-1] * (1 + shock)
             price_series.append(price)
-        plt.plot(price_series)
+        if price_paths is not None:
+            price_paths.append(price_series)
 
         average_predected_price_per_simulation.append(np.mean(price_series))
-    
-    print(f"Predicted price after {num_days} days: {np.mean(average_predected_price_per_simulation)}")
-    
-    plt.title(f"{ticker} Monte Carlo Simulation ({num_simulation} runs, {num_days} days)")
-    plt.xlabel("Days")
-    plt.ylabel("Simulated Price")
-    plt.show()
+
+    return np.mean(average_predected_price_per_simulation)
+
+
+@traced("monte_carlo.stock")
+def monte_carlo_stock_simulation(ticker, num_simulation, num_days):
+    # Imported here so the simulation itself can run offline, e.g. from the benchmarks
+    import yfinance as yf
+
+    with span("monte_carlo.stock.download", ticker=ticker):
+        data = yf.download(ticker, start="2020-01-01", end="2025-01-01")
+
+    price_paths = []
+    predicted_price = simulate_stock_prices(data["Close"], num_simulation, num_days, price_paths)
+    print(f"Predicted price after {num_days} days: {predicted_price}")
+
+    paths = [downsample(np.ravel(path)) for path in price_paths]
+
+    def draw(figure):
+        ax = figure.subplots()
+        for days, prices in paths:
+            ax.plot(days, prices)
+        ax.set_title(f"{ticker} Monte Carlo Simulation ({num_simulation} runs, {num_days} days)")
+        ax.set_xlabel("Days")
+        ax.set_ylabel("Simulated Price")
+
+    render(draw, f"{ticker}_monte_carlo_simulation")
 
     
 
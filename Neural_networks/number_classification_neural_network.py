@@ -8,18 +8,162 @@ Ranked Top 500 out of 195,366 entrants in Kaggle Competition - Rohan Desai
 https://www.kaggle.com/competitions/digit-recognizer/leaderboard
 '''
 
+import hashlib
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
 import pandas as pd
 import tensorflow as tf
 from tensorflow import keras
-from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from instrumentation import traced
+
+AUTOTUNE = tf.data.AUTOTUNE
+IMAGE_SHAPE = (28, 28)
+PIXELS = 28 * 28
+SPLITS = {"train": range(0, 14), "val": range(14, 17), "test": range(17, 20)}
+
+TRAIN_CSV = "Neural_networks/data/number_classification_train.csv"
+TEST_CSV = "Neural_networks/data/number_classification_test.csv"
+TRAIN_SHARDS = "Neural_networks/data/shards/train"
+TEST_SHARDS = "Neural_networks/data/shards/test"
+CACHE_DIR = "Neural_networks/data/cache"
+MODEL_PATH = "Neural_networks/data/digit_cnn.keras"
+CHECKPOINT_DIR = "Neural_networks/data/checkpoints"
+PERFORMANCE_BATCH_SIZE = 512
+
 
 def get_data(path):
     df = pd.read_csv(path)
     return df
 
-def build_cnn_model(input_shape):
+def convert_csv_to_shards(csv_path, shard_dir, has_label=True, rows_per_shard=10_000):
+    """
+    Rewrites the CSV as fixed-length uint8 records (label byte, if any, then 784 pixel bytes)
+    split across shard files, so later runs read raw bytes instead of parsing text.
+    Shards are written to a temporary directory that is renamed into place once complete, so
+    an interrupted conversion never leaves a truncated shard_dir behind.
+    """
+    tmp_dir = f"{shard_dir.rstrip(os.sep)}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    for i, chunk in enumerate(pd.read_csv(csv_path, chunksize=rows_per_shard)):
+        chunk.to_numpy(dtype=np.uint8).tofile(os.path.join(tmp_dir, f"shard-{i:05d}.bin"))
+    shutil.rmtree(shard_dir, ignore_errors=True)
+    os.rename(tmp_dir, shard_dir)
+    print(f"✅ Binary shards saved to: {shard_dir}")
+
+def source_fingerprint(source, *options):
+    # Size and mtime of the source file (or every shard in the directory), plus the options
+    # that shape the records, so a cache built from other data is never read back
+    paths = sorted(tf.io.gfile.glob(os.path.join(source, "*"))) if os.path.isdir(source) else [source]
+    digest = hashlib.sha256(repr(options).encode())
+    for path in paths:
+        stat = os.stat(path)
+        digest.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+    return digest.hexdigest()[:16]
+
+def _record_width(has_label):
+    return PIXELS + 1 if has_label else PIXELS
+
+def _csv_records(path, has_label, parse_batch_size=1024):
+    # Lines are decoded a batch at a time in parallel, then unbatched back into records
+    defaults = [[0]] * _record_width(has_label)
+
+    def parse(lines):
+        return tf.cast(tf.stack(tf.io.decode_csv(lines, record_defaults=defaults), axis=1), tf.uint8)
+
+    return (tf.data.TextLineDataset(path)
+            .skip(1)
+            .batch(parse_batch_size)
+            .map(parse, num_parallel_calls=AUTOTUNE)
+            .unbatch())
+
+def _binary_records(shard_dir, has_label):
+    files = sorted(tf.io.gfile.glob(os.path.join(shard_dir, "shard-*.bin")))
+
+    def parse(record):
+        return tf.io.decode_raw(record, tf.uint8)
+
+    return (tf.data.FixedLengthRecordDataset(files, record_bytes=_record_width(has_label))
+            .map(parse, num_parallel_calls=AUTOTUNE))
+
+def make_dataset(source, source_format="csv", has_label=True, split=None, batch_size=128,
+                 shuffle=False, shuffle_buffer=10_000, cache_path=None, seed=42):
+    """
+    Streams digit records from a CSV file or a directory of binary shards.
+    `split` keeps a deterministic 70/15/15 train/val/test slice by row index. Raw uint8 records
+    are cached to `cache_path` (suffixed with a fingerprint of the source) after the first
+    epoch, and normalization runs on whole batches inside the graph, so memory use stays flat
+    however large the source is.
+    """
+    if source_format == "csv":
+        records = _csv_records(source, has_label)
+    elif source_format == "binary":
+        records = _binary_records(source, has_label)
+    else:
+        raise ValueError(f"Unknown source_format: {source_format!r} (expected 'csv' or 'binary')")
+
+    if split is not None:
+        buckets = tf.constant(list(SPLITS[split]), dtype=tf.int64)
+        records = (records.enumerate()
+                   .filter(lambda i, record: tf.reduce_any(tf.equal(i % 20, buckets)))
+                   .map(lambda i, record: record))
+
+    if cache_path is not None:
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        fingerprint = source_fingerprint(source, source_format, has_label, split)
+        records = records.cache(f"{cache_path}-{fingerprint}")
+    if shuffle:
+        records = records.shuffle(shuffle_buffer, seed=seed, reshuffle_each_iteration=True)
+
+    def normalize(batch):
+        pixels = batch[:, -PIXELS:]
+        images = tf.reshape(tf.cast(pixels, tf.float32) / 255.0, (-1, *IMAGE_SHAPE))
+        if has_label:
+            return images, tf.cast(batch[:, 0], tf.int32)
+        return images
+
+    return records.batch(batch_size).map(normalize, num_parallel_calls=AUTOTUNE).prefetch(AUTOTUNE)
+
+def configure_threads(intra_op_threads=None, inter_op_threads=2):
+    # Must run before TensorFlow executes its first op, otherwise the pools are already fixed
+    tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads or os.cpu_count())
+    tf.config.threading.set_inter_op_parallelism_threads(inter_op_threads)
+
+def count_samples(dataset):
+    # One pass over the (labelled) dataset, counting rows rather than assuming full batches
+    return int(dataset.reduce(0, lambda n, batch: n + tf.shape(batch[1])[0]))
+
+class ThroughputLogger(keras.callbacks.Callback):
+    """
+    Training samples per second for each epoch. The clock stops at the end of the last
+    training batch, so the validation pass Keras runs before on_epoch_end is not counted.
+    """
+    def __init__(self, samples_per_epoch):
+        super().__init__()
+        self.samples_per_epoch = samples_per_epoch
+        self.history = []
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self.epoch_start = time.perf_counter()
+        self.train_end = self.epoch_start
+
+    def on_train_batch_end(self, batch, logs=None):
+        self.train_end = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        seconds = self.train_end - self.epoch_start
+        samples_per_second = self.samples_per_epoch / seconds
+        self.history.append({"epoch": epoch + 1, "seconds": seconds, "samples_per_second": samples_per_second})
+        print(f"\nEpoch {epoch + 1}: {seconds:.2f}s, {samples_per_second:,.0f} samples/s")
+
+def build_cnn_model(input_shape, jit_compile=False):
     model = keras.Sequential([
         keras.layers.Reshape((28, 28, 1), input_shape=input_shape),
         keras.layers.Conv2D(32, kernel_size=(3, 3), activation='relu'),
@@ -33,19 +177,54 @@ def build_cnn_model(input_shape):
     ])
     model.compile(optimizer='adam',
                   loss='sparse_categorical_crossentropy',
-                  metrics=['accuracy'])
+                  metrics=['accuracy'],
+                  jit_compile=jit_compile)
     return model
 
+@traced("digits.train_model")
 def train_model(X_train, y_train, X_val, y_val):
     model = build_cnn_model((28, 28))
     model.fit(X_train, y_train, epochs=10, validation_data=(X_val, y_val))
     return model
 
+@traced("digits.train_model_on_dataset")
+def train_model_on_dataset(train_ds, val_ds, epochs=10):
+    model = build_cnn_model((28, 28))
+    model.fit(train_ds, epochs=epochs, validation_data=val_ds)
+    return model
+
+@traced("digits.train_model_fast")
+def train_model_fast(train_ds, val_ds, max_epochs=50, patience=3, checkpoint_dir=CHECKPOINT_DIR):
+    """
+    XLA-compiled training with early stopping on validation loss (restoring the best weights)
+    and per-epoch backups, so an interrupted run resumes from its last finished epoch when
+    called again with the same checkpoint_dir.
+    """
+    model = build_cnn_model((28, 28), jit_compile=True)
+    throughput = ThroughputLogger(count_samples(train_ds))
+    callbacks = [
+        keras.callbacks.BackupAndRestore(os.path.join(checkpoint_dir, "backup")),
+        keras.callbacks.EarlyStopping(monitor="val_loss", patience=patience, restore_best_weights=True),
+        keras.callbacks.ModelCheckpoint(os.path.join(checkpoint_dir, "best.keras"), monitor="val_loss",
+                                        save_best_only=True),
+        throughput
+    ]
+    model.fit(train_ds, epochs=max_epochs, validation_data=val_ds, callbacks=callbacks)
+    return model, throughput.history
+
+@traced("digits.predict")
 def predict(model, X):
     predictions = model.predict(X)
     return predictions
 
-def evaluate_model(model, X_test, y_test):
+def save_model(model, path=MODEL_PATH):
+    model.save(path)
+    print(f"✅ Model saved to: {path}")
+
+def load_model(path=MODEL_PATH):
+    return keras.models.load_model(path)
+
+def evaluate_model(model, X_test, y_test=None):
     test_loss, test_acc = model.evaluate(X_test, y_test, verbose=2)
     print(f'\nTest accuracy: {test_acc}')
 
@@ -61,21 +240,25 @@ def create_submission_file(predictions, filename="submission.csv"):
 
 
 if __name__ == "__main__":
-    train_data = get_data("Neural_networks/data/number_classification_train.csv")
-    X = train_data.drop(columns=["label"]).values
-    y = train_data["label"].values
-
-    # Reshape and scale the data
-    X = X.reshape(-1, 28, 28).astype('float32') / 255.0
-
-    X_train, X_temp, y_train, y_temp = train_test_split(X, y, test_size=0.3, random_state=42)
-    X_val, X_test, y_val, y_test = train_test_split(X_temp, y_temp, test_size=0.5, random_state=42)
-    model = train_model(X_train, y_train, X_val, y_val)
-
-    evaluate_model(model, X_test, y_test)
-    
-    test_data = get_data("Neural_networks/data/number_classification_test.csv")
-    X_test = test_data.values.reshape(-1, 28, 28).astype('float32') / 255.0
-    predictions = predict(model, X_test)
+    configure_threads()
+
+    if not os.path.isdir(TRAIN_SHARDS):
+        convert_csv_to_shards(TRAIN_CSV, TRAIN_SHARDS)
+    if not os.path.isdir(TEST_SHARDS):
+        convert_csv_to_shards(TEST_CSV, TEST_SHARDS, has_label=False)
+
+    train_ds = make_dataset(TRAIN_SHARDS, "binary", split="train", shuffle=True,
+                            batch_size=PERFORMANCE_BATCH_SIZE, cache_path=f"{CACHE_DIR}/train")
+    val_ds = make_dataset(TRAIN_SHARDS, "binary", split="val", batch_size=PERFORMANCE_BATCH_SIZE,
+                          cache_path=f"{CACHE_DIR}/val")
+    test_ds = make_dataset(TRAIN_SHARDS, "binary", split="test")
+    model, throughput = train_model_fast(train_ds, val_ds)
+    print(pd.DataFrame(throughput).to_string(index=False))
+    save_model(model)
+
+    evaluate_model(model, test_ds)
+
+    submission_ds = make_dataset(TEST_SHARDS, "binary", has_label=False)
+    predictions = predict(model, submission_ds)
 
     create_submission_file(predictions, filename="submission.csv")
@@ -0,0 +1,146 @@
+'''
+CPU deployment path for the digit classifier.
+
+Converts the saved Keras model to TensorFlow Lite with dynamic-range and full-int8 quantization
+(calibrated on a sample of the training split), scores batches through the TFLite interpreter,
+and reports accuracy, model size and rows/second for each variant against the float Keras model.
+Throughput is the best of several runs after an untimed warm-up call, so Keras tracing is not
+counted. Sizes are compared without optimizer state: the Keras row counts its float32 weights
+only, and a float TFLite export is listed as the unquantized baseline.
+'''
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+
+from number_classification_neural_network import (
+    TRAIN_SHARDS, TEST_SHARDS, make_dataset, load_model, create_submission_file
+)
+
+TFLITE_DIR = "Neural_networks/data/tflite"
+
+
+def calibration_images(num_samples=500):
+    dataset = make_dataset(TRAIN_SHARDS, "binary", split="train", shuffle=True, batch_size=1)
+    for images, _ in dataset.take(num_samples):
+        yield [images]
+
+
+def convert_to_tflite(model, quantization="dynamic"):
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    if quantization == "dynamic":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    elif quantization == "int8":
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = calibration_images
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.int8
+        converter.inference_output_type = tf.int8
+    elif quantization != "float":
+        raise ValueError(f"Unknown quantization: {quantization!r} (expected 'float', 'dynamic' or 'int8')")
+    return converter.convert()
+
+
+def export_tflite_models(model, output_dir=TFLITE_DIR):
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {}
+    for quantization in ("float", "dynamic", "int8"):
+        path = os.path.join(output_dir, f"digit_cnn_{quantization}.tflite")
+        with open(path, "wb") as f:
+            f.write(convert_to_tflite(model, quantization))
+        paths[quantization] = path
+        print(f"✅ TFLite model saved to: {path}")
+    return paths
+
+
+class TFLiteRunner:
+    """
+    Batched TFLite inference. Handles the quantize/dequantize step for int8 models so callers
+    always pass float images in [0, 1] and get float class probabilities back.
+    """
+
+    def __init__(self, model_path, batch_size=256, num_threads=None):
+        self.batch_size = batch_size
+        self.interpreter = tf.lite.Interpreter(model_path=model_path, num_threads=num_threads)
+        self.input = self.interpreter.get_input_details()[0]
+        self.output = self.interpreter.get_output_details()[0]
+        self.interpreter.resize_tensor_input(self.input["index"], [batch_size, *self.input["shape"][1:]])
+        self.interpreter.allocate_tensors()
+
+    def _quantize(self, images):
+        if self.input["dtype"] == np.float32:
+            return images.astype(np.float32)
+        scale, zero_point = self.input["quantization"]
+        info = np.iinfo(self.input["dtype"])
+        return np.clip(np.round(images / scale + zero_point), info.min, info.max).astype(self.input["dtype"])
+
+    def _dequantize(self, outputs):
+        if self.output["dtype"] == np.float32:
+            return outputs
+        scale, zero_point = self.output["quantization"]
+        return (outputs.astype(np.float32) - zero_point) * scale
+
+    def predict(self, images):
+        predictions = []
+        for start in range(0, len(images), self.batch_size):
+            batch = images[start:start + self.batch_size]
+            rows = len(batch)
+            if rows < self.batch_size:
+                # The interpreter keeps a fixed batch shape; pad the tail and drop the padding
+                batch = np.concatenate([batch, np.zeros((self.batch_size - rows, *batch.shape[1:]), batch.dtype)])
+            self.interpreter.set_tensor(self.input["index"], self._quantize(batch))
+            self.interpreter.invoke()
+            predictions.append(self._dequantize(self.interpreter.get_tensor(self.output["index"]))[:rows])
+        return np.concatenate(predictions)
+
+
+def dataset_to_arrays(dataset):
+    images, labels = [], []
+    for batch_images, batch_labels in dataset:
+        images.append(batch_images.numpy())
+        labels.append(batch_labels.numpy())
+    return np.concatenate(images), np.concatenate(labels)
+
+
+def compare_models(model, tflite_paths, images, labels, repeats=5):
+    def measure(name, size_bytes, predict_fn):
+        # The first call pays for tf.function tracing (Keras) or tensor allocation (TFLite), so it
+        # stays untimed; rows/second comes from the best of the timed runs
+        predictions = predict_fn(images)
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            predict_fn(images)
+            timings.append(time.perf_counter() - start)
+        elapsed = min(timings)
+        return {
+            "model": name,
+            "accuracy": np.mean(predictions.argmax(axis=1) == labels),
+            "size_mb": size_bytes / 1e6,
+            "rows_per_second": len(images) / elapsed
+        }
+
+    # The .keras file also holds the Adam slots (~3x the weights), so size the weights alone
+    weight_bytes = sum(weights.nbytes for weights in model.get_weights())
+    results = [measure("keras float32 (weights)", weight_bytes,
+                       lambda x: model.predict(x, batch_size=256, verbose=0))]
+    for quantization, path in tflite_paths.items():
+        runner = TFLiteRunner(path)
+        results.append(measure(f"tflite {quantization}", os.path.getsize(path), runner.predict))
+    return pd.DataFrame(results)
+
+
+if __name__ == "__main__":
+    model = load_model()
+    tflite_paths = export_tflite_models(model)
+
+    images, labels = dataset_to_arrays(make_dataset(TRAIN_SHARDS, "binary", split="test"))
+    print(compare_models(model, tflite_paths, images, labels).to_string(index=False))
+
+    runner = TFLiteRunner(tflite_paths["int8"])
+    submission_ds = make_dataset(TEST_SHARDS, "binary", has_label=False, batch_size=runner.batch_size)
+    predictions = np.concatenate([runner.predict(batch.numpy()) for batch in submission_ds])
+    create_submission_file(predictions, filename="submission.csv")
@@ -1,10 +1,16 @@
+import os
+import sys
+
 import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
 from sklearn.preprocessing import LabelEncoder
-import matplotlib.pyplot as plt
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from instrumentation import traced
+from rendering import render
 
 
 class TitanicRandomForest:
@@ -43,6 +49,7 @@ class TitanicRandomForest:
         self.X_train, self.X_test = X_train, X_test
         self.y_train, self.y_test = y_train, y_test
 
+    @traced("titanic.train_model")
     def train_model(self):
         self.model.fit(self.X_train, self.y_train)
 
@@ -55,6 +62,7 @@ class TitanicRandomForest:
         print("\n🧮 Confusion Matrix:")
         print(confusion_matrix(self.y_test, y_pred))
 
+    @traced("titanic.predict_survival_probability")
     def predict_survival_probability(self, input_data: pd.DataFrame):
         for column, le in self.label_encoders.items():
             if column in input_data:
@@ -67,12 +75,15 @@ class TitanicRandomForest:
         indices = np.argsort(importances)[::-1]
         features = self.X_train.columns
 
-        plt.figure(figsize=(10, 6))
-        plt.title("Feature Importances - Titanic Random Forest")
-        plt.bar(range(len(importances)), importances[indices], align='center')
-        plt.xticks(range(len(importances)), [features[i] for i in indices], rotation=45)
-        plt.tight_layout()
-        plt.show()
+        labels = [features[i] for i in indices]
+
+        def draw(figure):
+            ax = figure.subplots()
+            ax.set_title("Feature Importances - Titanic Random Forest")
+            ax.bar(range(len(importances)), importances[indices], align='center')
+            ax.set_xticks(range(len(importances)), labels, rotation=45)
+
+        return render(draw, "titanic_feature_importance", figsize=(10, 6))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,122 @@
+'''
+Batch TVM functions against per-item Python loops: amortization schedules for a loan book
+(with the compounding-table cache cold and warm), NPV and IRR over a batch of projects.
+'''
+
+import time
+
+import numpy as np
+
+from time_value_money import amortization_schedule, clear_table_cache, irr, npv
+
+NUM_LOANS = 20_000
+NUM_PROJECTS = 100_000
+LOOP_ITEMS = 1_000
+
+
+def random_loan_book(num_loans, seed=42):
+    rng = np.random.default_rng(seed)
+    # Rates on an eighth-of-a-percent grid and standard terms, as in a real mortgage book
+    return (
+        rng.uniform(50_000, 500_000, num_loans),
+        rng.choice(np.arange(0.03, 0.08, 0.00125), num_loans),
+        rng.choice([120, 180, 360], num_loans),
+    )
+
+
+def random_projects(num_projects, seed=42):
+    rng = np.random.default_rng(seed)
+    cash_flows = np.column_stack([
+        -rng.uniform(500, 1_500, num_projects),
+        rng.uniform(0, 600, (num_projects, 9)),
+    ])
+    return rng.choice([0.06, 0.08, 0.10, 0.12], num_projects), cash_flows
+
+
+def amortize_loop(principals, rates, periods, frequency=12):
+    schedules = []
+    for principal, rate, n in zip(principals, rates, periods):
+        r = rate / frequency
+        payment = principal * r / (1 - (1 + r) ** -n)
+        balance = principal
+        rows = []
+        for _ in range(n):
+            interest = balance * r
+            balance -= payment - interest
+            rows.append((interest, payment - interest, balance))
+        schedules.append(rows)
+    return schedules
+
+
+def npv_loop(rates, cash_flows):
+    return [sum(cf / (1 + rate) ** t for t, cf in enumerate(row)) for rate, row in zip(rates, cash_flows)]
+
+
+def irr_loop(cash_flows, guess=0.1, tol=1e-10, max_iter=100):
+    results = []
+    for row in cash_flows:
+        r = guess
+        for _ in range(max_iter):
+            value = sum(cf / (1 + r) ** t for t, cf in enumerate(row))
+            slope = sum(-t * cf / (1 + r) ** (t + 1) for t, cf in enumerate(row))
+            step = value / slope
+            r -= step
+            if abs(step) < tol:
+                break
+        results.append(r)
+    return results
+
+
+def best_seconds(fn, repeats=3):
+    seconds = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        seconds.append(time.perf_counter() - start)
+    return min(seconds)
+
+
+def extrapolated_loop_seconds(loop, *batch, total):
+    # Each reference loop costs the same per item, so it runs on the first LOOP_ITEMS items only
+    # and its time is scaled to the `total` items the batch version handles
+    sample = [values[:LOOP_ITEMS] for values in batch]
+    return best_seconds(lambda: loop(*sample), repeats=1) * total / LOOP_ITEMS
+
+
+def run_benchmark(num_loans=NUM_LOANS, num_projects=NUM_PROJECTS):
+    principals, rates, periods = random_loan_book(num_loans)
+    clear_table_cache()
+    # Cold means the first call after clearing the table cache, so it can only be timed once
+    cold_seconds = best_seconds(lambda: amortization_schedule(principals, rates, periods), repeats=1)
+    warm_seconds = best_seconds(lambda: amortization_schedule(principals, rates, periods))
+    loop_seconds = extrapolated_loop_seconds(amortize_loop, principals, rates, periods, total=num_loans)
+    print(f"Amortization, {num_loans:,} loans")
+    print(f"  batch (cold cache):  {cold_seconds:>10.3f}s")
+    print(f"  batch (warm cache):  {warm_seconds:>10.3f}s")
+    print(f"  loop (scaled):       {loop_seconds:>10.3f}s  ({loop_seconds / warm_seconds:.1f}x)")
+
+    project_rates, cash_flows = random_projects(num_projects)
+    npv_seconds = best_seconds(lambda: npv(project_rates, cash_flows))
+    npv_loop_seconds = extrapolated_loop_seconds(npv_loop, project_rates, cash_flows, total=num_projects)
+    irr_seconds = best_seconds(lambda: irr(cash_flows))
+    irr_loop_seconds = extrapolated_loop_seconds(irr_loop, cash_flows, total=num_projects)
+    print(f"NPV, {num_projects:,} projects")
+    print(f"  batch:               {npv_seconds:>10.3f}s")
+    print(f"  loop (scaled):       {npv_loop_seconds:>10.3f}s  ({npv_loop_seconds / npv_seconds:.1f}x)")
+    print(f"IRR, {num_projects:,} projects")
+    print(f"  batch:               {irr_seconds:>10.3f}s")
+    print(f"  loop (scaled):       {irr_loop_seconds:>10.3f}s  ({irr_loop_seconds / irr_seconds:.1f}x)")
+
+    return {
+        "amortization_cold_seconds": cold_seconds,
+        "amortization_warm_seconds": warm_seconds,
+        "amortization_loop_seconds": loop_seconds,
+        "npv_seconds": npv_seconds,
+        "npv_loop_seconds": npv_loop_seconds,
+        "irr_seconds": irr_seconds,
+        "irr_loop_seconds": irr_loop_seconds,
+    }
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -6,10 +6,17 @@ The DCF method values a company based on its projected future cash flows,
 discounted back to present value.
 """
 
+import os
+import sys
+
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from instrumentation import span, traced
+from time_value_money import discount_factors
+
 
 class DCFCalculator:
     
@@ -61,15 +68,15 @@ class DCFCalculator:
         return self.terminal_value
     
     def discount_to_present_value(self) -> Tuple[List[float], float]:
+        # Discount factors for years 0..n come from the shared TVM table cache
+        years = len(self.growth_rates)
+        factors = discount_factors(self.discount_rate, years)
+
         # Discount projected FCF
-        self.pv_fcf = []
-        for year, fcf in enumerate(self.projected_fcf, start=1):
-            pv = fcf / ((1 + self.discount_rate) ** year)
-            self.pv_fcf.append(pv)
+        self.pv_fcf = (np.asarray(self.projected_fcf) * factors[1:]).tolist()
         
         # Discount Terminal Value
-        years = len(self.growth_rates)
-        self.pv_terminal_value = self.terminal_value / ((1 + self.discount_rate) ** years)
+        self.pv_terminal_value = float(self.terminal_value * factors[years])
         
         return self.pv_fcf, self.pv_terminal_value
     
@@ -85,18 +92,23 @@ class DCFCalculator:
         
         return self.intrinsic_value_per_share
     
+    @traced("dcf.run_valuation")
     def run_valuation(self) -> Dict:
         # Step 1: Project FCF
-        self.project_fcf()
+        with span("dcf.project_fcf"):
+            self.project_fcf()
         
         # Step 2: Calculate Terminal Value
-        self.calculate_terminal_value()
+        with span("dcf.terminal_value"):
+            self.calculate_terminal_value()
         
         # Step 3: Discount to Present Value
-        self.discount_to_present_value()
+        with span("dcf.discount"):
+            self.discount_to_present_value()
         
         # Step 4: Calculate Intrinsic Value
-        self.calculate_intrinsic_value()
+        with span("dcf.intrinsic_value"):
+            self.calculate_intrinsic_value()
         
         return self.get_results()
     
@@ -173,6 +185,7 @@ class DCFCalculator:
         
         print(f"{'='*70}\n")
     
+    @traced("dcf.sensitivity_analysis")
     def sensitivity_analysis(
         self,
         discount_range: Tuple[float, float] = (0.08, 0.14),
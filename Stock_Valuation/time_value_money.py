@@ -0,0 +1,251 @@
+"""
+Time Value of Money (TVM)
+
+Vectorized versions of the formulas in Financial_Learnings/time_value_money.md: future and
+present value, annuities, NPV, IRR and loan amortization schedules, evaluated over whole
+arrays of rates, periods and cash flows.
+
+Rates are nominal annual rates compounded `frequency` times a year, and `periods` counts
+compounding periods, so the rate per period is rate / frequency. With frequency=1 the
+formulas are exactly the ones in the notes.
+
+Compounding tables (1 + r)^k for k = 0..periods are memoized per (rate, periods,
+frequency) in a bounded LRU cache. Loan books and cash-flow batches usually share a handful
+of rate/term combinations, so schedules are assembled from a few cached tables instead of
+recomputing a power for every loan and period.
+"""
+
+import functools
+import os
+import sys
+import warnings
+
+import numpy as np
+from typing import Dict
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from instrumentation import traced
+
+
+# Distinct (rate, periods, frequency) tables kept in memory
+TABLE_CACHE_SIZE = 1_024
+
+
+@functools.lru_cache(maxsize=TABLE_CACHE_SIZE)
+def _compounding_table(rate: float, periods: int, frequency: int) -> np.ndarray:
+    table = np.power(1 + rate / frequency, np.arange(periods + 1, dtype=np.float64))
+    table.setflags(write=False)
+    return table
+
+
+@functools.lru_cache(maxsize=TABLE_CACHE_SIZE)
+def _discount_table(rate: float, periods: int, frequency: int) -> np.ndarray:
+    table = 1 / _compounding_table(rate, periods, frequency)
+    table.setflags(write=False)
+    return table
+
+
+def compounding_factors(rate: float, periods: int, frequency: int = 1) -> np.ndarray:
+    # (1 + r)^k for k = 0..periods; cached, so the returned array is read-only
+    return _compounding_table(float(rate), int(periods), int(frequency))
+
+
+def discount_factors(rate: float, periods: int, frequency: int = 1) -> np.ndarray:
+    # 1 / (1 + r)^k for k = 0..periods; cached, so the returned array is read-only
+    return _discount_table(float(rate), int(periods), int(frequency))
+
+
+def clear_table_cache():
+    _compounding_table.cache_clear()
+    _discount_table.cache_clear()
+
+
+def _factor_matrix(rate, periods, frequency, width, discount=False) -> np.ndarray:
+    '''
+    Row i holds the factors for (rate[i], periods[i], frequency[i]) for k = 0..width, zero
+    beyond periods[i]. Each distinct key is looked up in the table cache once and the rows
+    are gathered from it; when nearly every row is distinct, the powers are computed directly.
+    '''
+    # One integer code per (rate, periods, frequency); much cheaper than np.unique(axis=0)
+    codes = np.zeros(len(rate), dtype=np.int64)
+    for column in (rate, periods, frequency):
+        values, column_codes = np.unique(column, return_inverse=True)
+        codes = codes * len(values) + column_codes.ravel()
+    _, first, inverse = np.unique(codes, return_index=True, return_inverse=True)
+    k = np.arange(width + 1)
+
+    if len(first) > TABLE_CACHE_SIZE or len(first) > len(codes) // 4:
+        factors = np.power((1 + rate / frequency)[:, None], -k if discount else k)
+        return np.where(k <= periods[:, None], factors, 0.0)
+
+    lookup = discount_factors if discount else compounding_factors
+    tables = np.zeros((len(first), width + 1))
+    for i, row in enumerate(first):
+        tables[i, :periods[row] + 1] = lookup(rate[row], periods[row], frequency[row])
+    return tables[inverse.ravel()]
+
+
+def future_value(pv, rate, periods, frequency=1):
+    # FV = PV * (1 + r)^n
+    return np.asarray(pv) * np.power(1 + np.asarray(rate) / frequency, periods)
+
+
+def present_value(fv, rate, periods, frequency=1):
+    # PV = FV / (1 + r)^n
+    return np.asarray(fv) / np.power(1 + np.asarray(rate) / frequency, periods)
+
+
+def annuity_future_value(payment, rate, periods, frequency=1):
+    # FV = P * ((1 + r)^n - 1) / r, or P * n when r = 0
+    r = np.asarray(rate, dtype=np.float64) / frequency
+    safe_r = np.where(r == 0, 1.0, r)
+    factor = np.where(r == 0, periods, np.expm1(np.log1p(r) * periods) / safe_r)
+    return np.asarray(payment) * factor
+
+
+def annuity_present_value(payment, rate, periods, frequency=1):
+    # PV = P * (1 - (1 + r)^-n) / r, or P * n when r = 0
+    r = np.asarray(rate, dtype=np.float64) / frequency
+    safe_r = np.where(r == 0, 1.0, r)
+    factor = np.where(r == 0, periods, -np.expm1(-np.log1p(r) * periods) / safe_r)
+    return np.asarray(payment) * factor
+
+
+def loan_payment(principal, rate, periods, frequency=12):
+    # The level payment whose annuity present value equals the principal
+    return np.asarray(principal) / annuity_present_value(1.0, rate, periods, frequency)
+
+
+@traced("tvm.npv")
+def npv(rate, cash_flows, frequency=1):
+    '''
+    Net present value of cash flows at periods 0..T-1 along the last axis, the first one
+    undiscounted. `rate` broadcasts against the leading axes, one rate per cash-flow row.
+    '''
+    cash_flows = np.asarray(cash_flows, dtype=np.float64)
+    rows = cash_flows.reshape(-1, cash_flows.shape[-1])
+    rate = np.broadcast_to(np.asarray(rate, dtype=np.float64), cash_flows.shape[:-1]).ravel()
+    periods = rows.shape[1] - 1
+
+    discount = _factor_matrix(rate, np.full(len(rows), periods), np.full(len(rows), frequency),
+                              periods, discount=True)
+    return np.einsum("ij,ij->i", rows, discount).reshape(cash_flows.shape[:-1])
+
+
+@traced("tvm.irr")
+def irr(cash_flows, frequency=1, guess=0.1, tol=1e-10, max_iter=100):
+    '''
+    Internal rate of return of each cash-flow row, solved for all rows at once with Newton's
+    method. Rows that fail to converge (or have no sign change) come back as NaN with a
+    RuntimeWarning. The result is annualized as rate per period * frequency.
+    '''
+    cash_flows = np.asarray(cash_flows, dtype=np.float64)
+    rows = cash_flows.reshape(-1, cash_flows.shape[-1])
+    t = np.arange(rows.shape[1], dtype=np.float64)
+    r = np.full(len(rows), guess / frequency)
+
+    converged = np.zeros(len(rows), dtype=bool)
+    # Rows without a sign change send r to inf; they are frozen once r or the step stops being finite
+    diverged = np.zeros(len(rows), dtype=bool)
+    for _ in range(max_iter):
+        with np.errstate(over="ignore", divide="ignore", invalid="ignore"):
+            discount = np.exp(-np.log1p(r)[:, None] * t)
+            value = np.einsum("ij,ij->i", rows, discount)
+            # d/dr sum(CF_t (1 + r)^-t) = -sum(t * CF_t (1 + r)^-(t+1))
+            slope = -np.einsum("ij,ij->i", rows * t, discount) / (1 + r)
+            step = value / slope
+            diverged |= ~np.isfinite(step)
+            step[converged | diverged] = 0.0
+            # Keep 1 + r positive so the discount factors stay defined
+            r = np.maximum(r - step, -0.99)
+        diverged |= ~np.isfinite(r)
+        converged |= ~diverged & (np.abs(step) < tol)
+        if (converged | diverged).all():
+            break
+
+    if not converged.all():
+        warnings.warn(f"IRR did not converge for {np.count_nonzero(~converged)} cash-flow rows", RuntimeWarning)
+        r = np.where(converged, r, np.nan)
+    return (r * frequency).reshape(cash_flows.shape[:-1])
+
+
+@traced("tvm.amortization_schedule")
+def amortization_schedule(principal, rate, periods, frequency=12) -> Dict[str, np.ndarray]:
+    '''
+    Level-payment amortization for a book of loans. Returns the payment per loan and
+    (loans, max periods) arrays of interest, principal repaid and closing balance, zero after
+    each loan's final period. Scalar inputs give one-dimensional rows.
+    '''
+    single = all(np.ndim(value) == 0 for value in (principal, rate, periods, frequency))
+    principal, rate, periods, frequency = (
+        np.atleast_1d(value) for value in np.broadcast_arrays(principal, rate, periods, frequency)
+    )
+    principal = principal.astype(np.float64)
+    rate = rate.astype(np.float64)
+    periods = periods.astype(np.int64)
+    if np.any(periods < 1) or np.any(principal < 0) or np.any(frequency < 1):
+        raise ValueError("Loans need periods >= 1, principal >= 0 and frequency >= 1")
+    width = int(periods.max())
+
+    growth = _factor_matrix(rate, periods, frequency, width)
+    r = rate / frequency
+    payment = loan_payment(principal, rate, periods, frequency)
+
+    # Balance after k payments: P ((1 + r)^n - (1 + r)^k) / ((1 + r)^n - 1), exactly zero at k = n
+    final_growth = np.power(1 + r, periods)
+    zero_rate = r == 0
+    scale = principal / np.where(zero_rate, 1.0, final_growth - 1)
+    balance = (final_growth * scale)[:, None] - growth * scale[:, None]
+    if zero_rate.any():
+        # Without interest the principal is repaid in equal parts
+        k = np.arange(width + 1)
+        balance[zero_rate] = principal[zero_rate, None] * (1 - k / periods[zero_rate, None])
+
+    # Interest accrues on the opening balance; everything past a loan's last period is zero
+    inactive = np.arange(1, width + 1) > periods[:, None]
+    interest = balance[:, :-1] * r[:, None]
+    interest[inactive] = 0.0
+    principal_repaid = payment[:, None] - interest
+    principal_repaid[inactive] = 0.0
+    balance = balance[:, 1:]
+    balance[inactive] = 0.0
+
+    schedule = {
+        "payment": payment,
+        "interest": interest,
+        "principal": principal_repaid,
+        "balance": balance,
+    }
+    if single:
+        schedule = {name: values[0] for name, values in schedule.items()}
+    return schedule
+
+
+def example_tvm():
+    print("\n" + "="*70)
+    print("EXAMPLE: TIME VALUE OF MONEY")
+    print("="*70)
+
+    print(f"\n$1,000 in 5 years at 6%: PV = ${present_value(1000, 0.06, 5):,.2f}")
+    print(f"$1,000 today for 5 years at 6%: FV = ${future_value(1000, 0.06, 5):,.2f}")
+    print(f"$100 a year for 10 years at 5%: FV = ${annuity_future_value(100, 0.05, 10):,.2f}, "
+          f"PV = ${annuity_present_value(100, 0.05, 10):,.2f}")
+
+    cash_flows = np.array([
+        [-1000, 300, 400, 500],
+        [-1000, 100, 100, 1200],
+    ])
+    print(f"\nNPV at 8%: {np.round(npv(0.08, cash_flows), 2)}")
+    print(f"IRR:       {np.round(irr(cash_flows) * 100, 2)}%")
+
+    schedule = amortization_schedule(200_000, 0.06, 360, frequency=12)
+    print(f"\n$200,000 30-year mortgage at 6%: monthly payment ${schedule['payment']:,.2f}")
+    print(f"{'Month':<8}{'Interest':>12}{'Principal':>12}{'Balance':>14}")
+    for month in [0, 1, 2, 119, 239, 359]:
+        print(f"{month + 1:<8}{schedule['interest'][month]:>12,.2f}{schedule['principal'][month]:>12,.2f}"
+              f"{schedule['balance'][month]:>14,.2f}")
+    print(f"Total interest: ${schedule['interest'].sum():,.2f}\n")
+
+
+if __name__ == "__main__":
+    example_tvm()
@@ -0,0 +1,297 @@
+'''
+Performance regression suite for the hot paths across the projects.
+
+Every case runs offline on generated data with fixed seeds, at each of its parametrized sizes.
+Fast cases are called in an inner loop, calibrated like timeit's autorange, so every sample
+lasts at least MIN_SAMPLE_SECONDS; the best and median of N samples are recorded per call. They
+are appended to a JSON history file and compared with the median of the last few runs in that
+history, so one noisy run doesn't become the baseline. Anything slower than its threshold is
+reported as a regression and the exit code is non-zero.
+
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --only dcf monte_carlo --threshold 0.2
+    python benchmarks/run_benchmarks.py --threshold-for titanic.fit_predict=0.5 --no-save
+    python benchmarks/run_benchmarks.py --window 10 --min-seconds 0.005
+'''
+
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIRS = [
+    "Stock_Valuation", "Monte_Carlo_Simulation", "Markov_Chains", "Linear_Regression",
+    "Random_Forest_Machine_Learning", "Machine_Learning_Shared", "Fixed_Income",
+]
+for project_dir in PROJECT_DIRS:
+    sys.path.append(os.path.join(REPO_ROOT, project_dir))
+
+HISTORY_PATH = os.path.join(REPO_ROOT, "benchmarks", "history.json")
+DEFAULT_THRESHOLD = 0.25
+SEED = 42
+MIN_SAMPLE_SECONDS = 0.05
+# Baseline = median of this many previous runs; timings below the floor are too noisy to compare
+DEFAULT_WINDOW = 5
+DEFAULT_MIN_SECONDS = 1e-3
+
+BENCHMARKS = []
+
+
+def benchmark(name, sizes):
+    '''
+    Registers a case. The decorated function takes a size, does its setup and returns the
+    zero-argument callable that gets timed.
+    '''
+    def decorator(setup):
+        BENCHMARKS.append({"name": name, "sizes": sizes, "setup": setup})
+        return setup
+    return decorator
+
+
+def seed_everything(seed=SEED):
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+def _dcf_calculator(years):
+    from dcf_calculator import DCFCalculator
+    growth_rates = list(np.linspace(0.15, 0.03, years))
+    return DCFCalculator(
+        company_name="Benchmark Co",
+        current_fcf=1000,
+        growth_rates=growth_rates,
+        terminal_growth_rate=0.025,
+        discount_rate=0.10,
+        shares_outstanding=500,
+        cash=2000,
+        debt=1500
+    )
+
+
+@benchmark("dcf.run_valuation", sizes=[5, 50, 500])
+def bench_dcf_run_valuation(years):
+    return _dcf_calculator(years).run_valuation
+
+
+@benchmark("dcf.sensitivity_analysis", sizes=[5, 10, 15])
+def bench_dcf_sensitivity(steps):
+    calculator = _dcf_calculator(5)
+    return lambda: calculator.sensitivity_analysis(steps=steps)
+
+
+@benchmark("tvm.amortization_schedule", sizes=[1_000, 10_000])
+def bench_amortization(num_loans):
+    from time_value_money import amortization_schedule
+    from benchmark_tvm import random_loan_book
+    principals, rates, periods = random_loan_book(num_loans, seed=SEED)
+    return lambda: amortization_schedule(principals, rates, periods)
+
+
+@benchmark("monte_carlo.dice_sum", sizes=[10_000, 100_000])
+def bench_dice_sum(num_simulations):
+    from monte_carlo_dice_simulation import monte_carlo_dice_sum_simulation
+    return lambda: monte_carlo_dice_sum_simulation(num_simulations, 7)
+
+
+@benchmark("monte_carlo.pi", sizes=[10_000, 100_000])
+def bench_pi(num_simulations):
+    from monte_carlo_pie_simulation import monte_carlo_pi_simulation
+    return lambda: monte_carlo_pi_simulation(num_simulations)
+
+
+@benchmark("monte_carlo.stock", sizes=[10, 100])
+def bench_stock(num_simulation):
+    import pandas as pd
+    from monte_carlo_stock_simulation import simulate_stock_prices
+    rng = np.random.default_rng(SEED)
+    close_prices = pd.Series(100 * np.cumprod(1 + rng.normal(0.0005, 0.02, 1_000)))
+    return lambda: simulate_stock_prices(close_prices, num_simulation, 252)
+
+
+@benchmark("bonds.revalue", sizes=[1_000, 10_000])
+def bench_bond_revalue(num_bonds):
+    from bond_analytics import BondPortfolio
+    from benchmark_bonds import random_portfolio
+    bonds, yields = random_portfolio(num_bonds, seed=SEED)
+    portfolio = BondPortfolio(bonds)
+    shocks = np.linspace(-0.02, 0.02, 100)
+    return lambda: portfolio.revalue(yields, shocks)
+
+
+@benchmark("markov.snake_and_ladder.simulate_game", sizes=[10, 100])
+def bench_snake_and_ladder(num_games):
+    from markov_chains_snake_and_ladder import SnakeAndLadderMarkovChain
+    game = SnakeAndLadderMarkovChain()
+    return lambda: [game.simulate_game() for _ in range(num_games)]
+
+
+@benchmark("markov.weather.simulate_days", sizes=[1_000, 100_000])
+def bench_weather(num_days):
+    from markov_chains_day_cycle import WeatherMarkovChain
+    chain = WeatherMarkovChain()
+    return lambda: chain.simulate_days(num_days)
+
+
+@benchmark("linear_regression.gradient_descent", sizes=[1_000, 10_000])
+def bench_gradient_descent(epochs):
+    from linear_regression import gradient_descent
+    from generate_data_set import generate_linear_regression_data
+    data = generate_linear_regression_data(n_samples=1_000, seed=SEED)
+    x, y = data["YearsExperience"].values, data["Salary"].values
+    return lambda: gradient_descent(x, y, learning_rate=1e-4, epochs=epochs)
+
+
+@benchmark("titanic.fit_predict", sizes=[1_000, 10_000])
+def bench_titanic(n_samples):
+    from random_forest import TitanicRandomForest
+    from generate_data_set import generate_titanic_data
+    # The CSV stays in memory, so repeated runs leave no files behind
+    csv_text = generate_titanic_data(n_samples=n_samples, seed=SEED).to_csv(index=False)
+
+    def fit_predict():
+        model = TitanicRandomForest(data_path=io.StringIO(csv_text), n_trees=100, random_state=SEED)
+        model.preprocess_data()
+        model.train_model()
+        return model.predict_survival_probability(model.X_test.copy())
+    return fit_predict
+
+
+def _time_loops(run, loops):
+    seed_everything()
+    start = time.perf_counter()
+    for _ in range(loops):
+        run()
+    return time.perf_counter() - start
+
+
+def calibrate_loops(run, min_seconds=MIN_SAMPLE_SECONDS):
+    # Same progression as timeit.Timer.autorange: 1, 2, 5, 10, 20, 50, ... calls per sample
+    loops = 1
+    while True:
+        for multiplier in (1, 2, 5):
+            if _time_loops(run, loops * multiplier) >= min_seconds:
+                return loops * multiplier
+        loops *= 10
+
+
+def time_case(run, repeats):
+    # Returns the best and median seconds per call and the number of calls per sample
+    loops = calibrate_loops(run)
+    timings = [_time_loops(run, loops) / loops for _ in range(repeats)]
+    return min(timings), statistics.median(timings), loops
+
+
+def run_suite(only=None, repeats=5):
+    results = []
+    for case in BENCHMARKS:
+        if only and not any(case["name"].startswith(prefix) for prefix in only):
+            continue
+        for size in case["sizes"]:
+            seed_everything()
+            run = case["setup"](size)
+            best, median, loops = time_case(run, repeats)
+            results.append({
+                "name": case["name"],
+                "size": size,
+                "best_seconds": best,
+                "median_seconds": median,
+                "loops": loops
+            })
+            print(f"{case['name']:<42}{size:>10,}{best:>12.6f}s{median:>12.6f}s{loops:>8,}")
+    return results
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+def baseline_times(history, window=DEFAULT_WINDOW):
+    # Median best time per case and size over the last `window` runs that included it
+    times = {}
+    for run in history[-window:]:
+        for r in run["results"]:
+            times.setdefault((r["name"], r["size"]), []).append(r["best_seconds"])
+    return {key: statistics.median(values) for key, values in times.items()}
+
+
+def compare(results, history, threshold, overrides, window=DEFAULT_WINDOW, min_seconds=DEFAULT_MIN_SECONDS):
+    baseline = baseline_times(history, window)
+    regressions = []
+    for result in results:
+        before = baseline.get((result["name"], result["size"]))
+        if before is None or before < min_seconds:
+            continue
+        limit = overrides.get(result["name"], threshold)
+        ratio = result["best_seconds"] / before
+        if ratio > 1 + limit:
+            regressions.append({**result, "baseline_seconds": before, "ratio": ratio, "threshold": limit})
+    return regressions
+
+
+def parse_overrides(pairs):
+    overrides = {}
+    for pair in pairs or []:
+        name, _, value = pair.partition("=")
+        overrides[name] = float(value)
+    return overrides
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the cross-project performance benchmarks")
+    parser.add_argument("--only", nargs="+", help="run cases whose name starts with any of these")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--history", default=HISTORY_PATH)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown against the baseline, e.g. 0.25 for 25%%")
+    parser.add_argument("--threshold-for", nargs="+", metavar="NAME=VALUE",
+                        help="per-case threshold overrides")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW,
+                        help="number of previous runs whose median is the baseline")
+    parser.add_argument("--min-seconds", type=float, default=DEFAULT_MIN_SECONDS,
+                        help="skip cases whose baseline is faster than this")
+    parser.add_argument("--no-save", action="store_true", help="don't append this run to the history")
+    args = parser.parse_args()
+
+    print(f"{'benchmark':<42}{'size':>10}{'best':>13}{'median':>13}{'loops':>8}")
+    results = run_suite(args.only, args.repeats)
+
+    history = load_history(args.history)
+    regressions = []
+    if history:
+        regressions = compare(results, history, args.threshold, parse_overrides(args.threshold_for),
+                              args.window, args.min_seconds)
+        for row in regressions:
+            print(f"⚠️  Regression: {row['name']} size={row['size']:,} {row['baseline_seconds']:.6f}s -> "
+                  f"{row['best_seconds']:.6f}s ({row['ratio']:.2f}x, limit {1 + row['threshold']:.2f}x)")
+        if not regressions:
+            runs = min(len(history), args.window)
+            print(f"✅ No regressions against the median of the last {runs} runs "
+                  f"(since {history[-runs]['timestamp']})")
+
+    if not args.no_save:
+        history.append({
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "results": results,
+        })
+        with open(args.history, "w") as f:
+            json.dump(history, f, indent=2)
+        print(f"✅ Results appended to: {args.history}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,19 @@
+'''
+Lightweight timing hooks shared by the projects in this repository.
+
+The project folders are run as scripts, so instrumented modules put the repository root on
+sys.path before importing this package. See metrics.py and profiler.py for the environment
+variables that switch recording and profiling on.
+'''
+
+from .metrics import (
+    Histogram, count, disable, enable, enabled, observe, reset, snapshot, span, summary_table, traced
+)
+from .profiler import SamplingProfiler, start_from_environment
+
+_profiler = start_from_environment()
+
+__all__ = [
+    "Histogram", "SamplingProfiler", "count", "disable", "enable", "enabled", "observe", "reset",
+    "snapshot", "span", "summary_table", "traced",
+]
@@ -0,0 +1,220 @@
+'''
+Spans, counters and histograms.
+
+Everything is off unless INSTRUMENTATION=1 is set (or enable() is called). While off, span()
+hands back one shared no-op object and traced functions go straight to the wrapped function
+after a single flag check, so the hooks can stay in production code.
+
+    INSTRUMENTATION=1                     record spans, counters and histograms
+    INSTRUMENTATION_OUTPUT=spans.jsonl    also append every finished span as a JSON line
+    INSTRUMENTATION_SUMMARY=0             skip the summary table printed at exit
+'''
+
+import atexit
+import functools
+import json
+import math
+import os
+import threading
+import time
+
+
+class _State:
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.output = None
+        self.local = threading.local()
+
+
+_state = _State()
+
+
+class Histogram:
+    '''Streaming count/sum/min/max plus power-of-two buckets for approximate percentiles.'''
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.buckets = {}
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        bucket = math.frexp(value)[1] if value > 0 else None
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def percentile(self, q):
+        # Upper edge of the bucket holding the q-th value, clamped to the observed range
+        target = q * self.count
+        seen = 0
+        for bucket in sorted(self.buckets, key=lambda b: -math.inf if b is None else b):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                upper = 0.0 if bucket is None else math.ldexp(1.0, bucket)
+                return min(max(upper, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
+def enabled():
+    return _state.enabled
+
+
+def enable(output_path=None):
+    _state.enabled = True
+    if output_path is not None and _state.output is None:
+        _state.output = open(output_path, "a", buffering=1 << 16)
+
+
+def disable():
+    _state.enabled = False
+    if _state.output is not None:
+        _state.output.close()
+        _state.output = None
+
+
+def reset():
+    with _state.lock:
+        _state.counters.clear()
+        _state.histograms.clear()
+
+
+def count(name, value=1):
+    if not _state.enabled:
+        return
+    with _state.lock:
+        _state.counters[name] = _state.counters.get(name, 0) + value
+
+
+def observe(name, value):
+    if not _state.enabled:
+        return
+    with _state.lock:
+        histogram = _state.histograms.get(name)
+        if histogram is None:
+            histogram = _state.histograms[name] = Histogram()
+        histogram.add(value)
+
+
+class _Span:
+    __slots__ = ("name", "attributes", "start", "parent")
+
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self):
+        stack = getattr(_state.local, "stack", None)
+        if stack is None:
+            stack = _state.local.stack = []
+        self.parent = stack[-1] if stack else None
+        stack.append(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        _state.local.stack.pop()
+        observe(self.name, seconds)
+        if _state.output is not None:
+            record = {
+                "span": self.name,
+                "parent": self.parent,
+                "seconds": seconds,
+                "end": time.time(),
+                "thread": threading.current_thread().name,
+                "error": exc_type.__name__ if exc_type is not None else None,
+                **self.attributes
+            }
+            line = json.dumps(record, default=str)
+            with _state.lock:
+                _state.output.write(line + "\n")
+        return False
+
+
+class _NoOpSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NO_OP_SPAN = _NoOpSpan()
+
+
+def span(name, **attributes):
+    '''Context manager timing the enclosed block; the duration feeds the histogram `name`.'''
+    if not _state.enabled:
+        return _NO_OP_SPAN
+    return _Span(name, attributes)
+
+
+def traced(name=None):
+    '''Decorator form of span(), named after the function's qualified name by default.'''
+    def decorator(function):
+        span_name = name or f"{function.__module__}.{function.__qualname__}"
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _state.enabled:
+                return function(*args, **kwargs)
+            with _Span(span_name, {}):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def snapshot():
+    with _state.lock:
+        return {
+            "counters": dict(_state.counters),
+            "histograms": {
+                name: {
+                    "count": h.count, "total": h.total, "mean": h.mean, "min": h.min, "max": h.max,
+                    "p50": h.percentile(0.5), "p95": h.percentile(0.95)
+                }
+                for name, h in _state.histograms.items()
+            }
+        }
+
+
+def summary_table():
+    data = snapshot()
+    lines = []
+    if data["histograms"]:
+        lines.append(f"{'span / histogram':<48}{'count':>8}{'total':>12}{'mean':>12}{'p95':>12}{'max':>12}")
+        for name, h in sorted(data["histograms"].items(), key=lambda item: -item[1]["total"]):
+            lines.append(f"{name:<48}{h['count']:>8}{h['total']:>12.4g}{h['mean']:>12.4g}"
+                         f"{h['p95']:>12.4g}{h['max']:>12.4g}")
+    if data["counters"]:
+        lines.append(f"{'counter':<48}{'value':>8}")
+        for name, value in sorted(data["counters"].items()):
+            lines.append(f"{name:<48}{value:>8}")
+    return "\n".join(lines)
+
+
+def _report_at_exit():
+    if _state.enabled and os.environ.get("INSTRUMENTATION_SUMMARY", "1") != "0":
+        table = summary_table()
+        if table:
+            print(f"\n{'='*104}\nINSTRUMENTATION SUMMARY\n{'='*104}\n{table}")
+    disable()
+
+
+if os.environ.get("INSTRUMENTATION", "0") not in ("", "0"):
+    enable(os.environ.get("INSTRUMENTATION_OUTPUT"))
+
+atexit.register(_report_at_exit)
@@ -0,0 +1,102 @@
+'''
+Whole-process profiling, switched on by environment variable.
+
+    INSTRUMENTATION_PROFILE=cprofile    deterministic cProfile; stats are dumped at exit
+    INSTRUMENTATION_PROFILE=sampling    background thread samples the main thread's stack
+    INSTRUMENTATION_PROFILE_OUTPUT=...  where to write (.prof for cProfile, collapsed stacks
+                                        for sampling, readable by flamegraph.pl / speedscope)
+    INSTRUMENTATION_SAMPLE_INTERVAL=0.005  seconds between samples
+'''
+
+import atexit
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+
+
+class SamplingProfiler:
+    def __init__(self, interval=0.005, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.main_thread().ident
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write_collapsed(self, path):
+        with open(path, "w") as f:
+            for stack, samples in self.samples.most_common():
+                f.write(f"{stack} {samples}\n")
+
+    def top(self, limit=20):
+        # Self time: how often each frame was the innermost one when sampled
+        leaves = Counter()
+        for stack, samples in self.samples.items():
+            leaves[stack.rsplit(";", 1)[-1]] += samples
+        total = sum(leaves.values()) or 1
+        return [(frame, samples, samples / total) for frame, samples in leaves.most_common(limit)]
+
+
+def _start_cprofile(output_path):
+    profiler = cProfile.Profile()
+    profiler.enable()
+
+    def finish():
+        profiler.disable()
+        profiler.dump_stats(output_path)
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(20)
+        print(stream.getvalue())
+        print(f"✅ cProfile stats saved to: {output_path}")
+
+    atexit.register(finish)
+    return profiler
+
+
+def _start_sampling(output_path, interval):
+    profiler = SamplingProfiler(interval).start()
+
+    def finish():
+        profiler.stop()
+        profiler.write_collapsed(output_path)
+        print(f"\n{'self samples':>14}{'share':>8}  frame")
+        for frame, samples, share in profiler.top():
+            print(f"{samples:>14}{share:>8.1%}  {frame}")
+        print(f"✅ Sampled stacks saved to: {output_path}")
+
+    atexit.register(finish)
+    return profiler
+
+
+def start_from_environment():
+    mode = os.environ.get("INSTRUMENTATION_PROFILE", "").lower()
+    if mode == "cprofile":
+        return _start_cprofile(os.environ.get("INSTRUMENTATION_PROFILE_OUTPUT", "instrumentation.prof"))
+    if mode == "sampling":
+        interval = float(os.environ.get("INSTRUMENTATION_SAMPLE_INTERVAL", "0.005"))
+        return _start_sampling(os.environ.get("INSTRUMENTATION_PROFILE_OUTPUT", "instrumentation.stacks"), interval)
+    if mode:
+        raise ValueError(f"Unknown INSTRUMENTATION_PROFILE: {mode!r} (expected 'cprofile' or 'sampling')")
+    return None
@@ -0,0 +1,9 @@
+'''
+Shared plotting layer: figures are written to files by a background worker instead of being
+shown, so batch runs never block on a GUI. Like instrumentation, project scripts put the
+repository root on sys.path before importing this package.
+'''
+
+from .renderer import downsample, render, wait_for_renders
+
+__all__ = ["downsample", "render", "wait_for_renders"]
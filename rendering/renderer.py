@@ -0,0 +1,109 @@
+'''
+Headless, asynchronous figure rendering.
+
+render() queues a draw callback on a single background worker, which builds a matplotlib
+Figure through the object-oriented API (no pyplot, no GUI backend) and writes it to PNG/SVG
+files while the caller carries on computing. matplotlib is imported by the worker the first
+time a figure is rendered, so scripts that never plot never pay for it.
+
+    PLOT_OUTPUT_DIR=plots      where figures are written
+    PLOT_FORMATS=png,svg       default output formats
+'''
+
+import atexit
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+DEFAULT_MAX_POINTS = 2_000
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = []
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # One worker keeps matplotlib single-threaded; figures are rendered in submission order
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="renderer")
+        return _executor
+
+
+def _output_formats(formats):
+    if formats is not None:
+        return tuple(formats)
+    return tuple(f.strip() for f in os.environ.get("PLOT_FORMATS", "png").split(",") if f.strip())
+
+
+def _render(draw, path_stem, formats, figsize):
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=figsize)
+    draw(figure)
+    figure.tight_layout()
+    paths = []
+    for fmt in formats:
+        path = f"{path_stem}.{fmt}"
+        figure.savefig(path, format=fmt)
+        paths.append(path)
+    print(f"✅ Plot saved to: {', '.join(paths)}")
+    return paths
+
+
+def _report_failure(future):
+    error = future.exception()
+    if error is not None:
+        print(f"⚠️  Plot rendering failed: {error!r}")
+
+
+def render(draw, name, formats=None, figsize=(8, 5), output_dir=None):
+    '''
+    Queues `draw(figure)` for rendering to `<output_dir>/<name>.<fmt>` and returns a Future
+    resolving to the written paths. Arrays captured by `draw` should not be mutated afterwards.
+    '''
+    output_dir = output_dir or os.environ.get("PLOT_OUTPUT_DIR", "plots")
+    os.makedirs(output_dir, exist_ok=True)
+    future = _get_executor().submit(_render, draw, os.path.join(output_dir, name), _output_formats(formats), figsize)
+    future.add_done_callback(_report_failure)
+    _pending.append(future)
+    return future
+
+
+def wait_for_renders():
+    '''Blocks until every queued figure has been written; returns their paths.'''
+    paths = []
+    while _pending:
+        future = _pending.pop(0)
+        if future.exception() is None:
+            paths.extend(future.result())
+    return paths
+
+
+def downsample(y, x=None, max_points=DEFAULT_MAX_POINTS):
+    '''
+    Reduces a series to at most about max_points by keeping each bucket's min and max, so spikes
+    survive the reduction. Returns (x, y); x defaults to the sample index.
+    '''
+    y = np.asarray(y)
+    x = np.arange(len(y)) if x is None else np.asarray(x)
+    if len(y) <= max_points:
+        return x, y
+
+    buckets = max(max_points // 2, 1)
+    edges = np.linspace(0, len(y), buckets + 1).astype(np.int64)
+    keep = []
+    for start, stop in zip(edges[:-1], edges[1:]):
+        if stop <= start:
+            continue
+        window = y[start:stop]
+        low, high = start + int(np.argmin(window)), start + int(np.argmax(window))
+        keep.extend(sorted({low, high}))
+    keep = np.array(keep)
+    return x[keep], y[keep]
+
+
+atexit.register(wait_for_renders)